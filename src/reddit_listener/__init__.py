@@ -15,7 +15,9 @@ Public API:
     - RelevanceScorer, ScoredPost: Post relevance filtering
 """
 
+from importlib import import_module
 from importlib.metadata import version, PackageNotFoundError
+from typing import TYPE_CHECKING, Any
 
 try:
     __version__ = version("reddit-listener")
@@ -23,17 +25,62 @@ except PackageNotFoundError:
     # Package not installed, use development version
     __version__ = "0.0.0.dev"
 
-# Core research functionality
-from .core import DiscoveryResult, ResearchResult, ResearchService, SyncResearchService
-from .reddit import RedditClient, RelevanceScorer, ScoredPost
-from .analysis import ContentIdea, DetailedContext, LLMAnalyzer, PainPoint
+if TYPE_CHECKING:
+    # Core research functionality
+    from .core import DiscoveryResult, ResearchResult, ResearchService, SyncResearchService
+    from .reddit import RedditClient, RelevanceScorer, ScoredPost
+    from .analysis import ContentIdea, DetailedContext, LLMAnalyzer, PainPoint
 
-# Storage interfaces and implementations
-from .storage import SQLiteTokenStore, TokenStore
-from .storage.base import TokenData
+    # Storage interfaces and implementations
+    from .storage import SQLiteTokenStore, TokenStore
+    from .storage.base import TokenData
+
+    # Configuration
+    from .config import Config, LLMConfig, RedditConfig, SlackConfig, StorageConfig
+
+# Public names are imported on first access (PEP 562) so that importing the
+# package does not pull in asyncpraw, httpx, aiosqlite, etc. up front
+_LAZY_IMPORTS = {
+    # Core research functionality
+    "DiscoveryResult": ".core",
+    "ResearchResult": ".core",
+    "ResearchService": ".core",
+    "SyncResearchService": ".core",
+    "RedditClient": ".reddit",
+    "RelevanceScorer": ".reddit",
+    "ScoredPost": ".reddit",
+    "ContentIdea": ".analysis",
+    "DetailedContext": ".analysis",
+    "LLMAnalyzer": ".analysis",
+    "PainPoint": ".analysis",
+    # Storage interfaces and implementations
+    "SQLiteTokenStore": ".storage",
+    "TokenStore": ".storage",
+    "TokenData": ".storage.base",
+    # Configuration
+    "Config": ".config",
+    "LLMConfig": ".config",
+    "RedditConfig": ".config",
+    "SlackConfig": ".config",
+    "StorageConfig": ".config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names lazily on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__() -> list:
+    """Include lazily imported names in dir()."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# Configuration
-from .config import Config, LLMConfig, RedditConfig, SlackConfig, StorageConfig
 
 __all__ = [
     # Version
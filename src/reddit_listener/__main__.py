@@ -1,16 +1,51 @@
 """Main entry point for Reddit Listener."""
 
 import asyncio
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from .slack.app import start_bot
 
+try:
+    import uvloop
+except ImportError:  # Optional speedup, not available on Windows
+    uvloop = None
+
+
+def _configure_logging() -> QueueListener:
+    """Send log records through a queue so handlers never block the event loop.
+
+    Returns:
+        The started listener that writes queued records to stderr
+    """
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
 
 def main() -> None:
     """Main entry point."""
+    listener = _configure_logging()
+
     try:
-        asyncio.run(start_bot())
+        if uvloop is not None:
+            uvloop.run(start_bot())
+        else:
+            asyncio.run(start_bot())
     except KeyboardInterrupt:
         print("\n👋 Shutting down Reddit Listener...")
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
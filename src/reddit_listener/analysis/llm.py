@@ -1,18 +1,343 @@
 """LLM analysis using OpenRouter with Minimax model."""
 
-import json
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import httpx
+import orjson
 
+from ..reddit.rate_limiter import TokenBucketRateLimiter
 from ..reddit.retry import async_retry_with_backoff
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fail fast on connect; the read timeout applies between streamed chunks
+_DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=90.0, write=20.0, pool=5.0)
+
+# Detailed context generates 500-2000 words, so allow longer gaps between chunks
+_DETAILED_CONTEXT_TIMEOUT = httpx.Timeout(connect=5.0, read=180.0, write=20.0, pool=5.0)
+
+# Connection pool for each analyzer's HTTP client
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=300.0,
+)
+
+
+# Doubled closing quote after a sentence (e.g. "text."" followed by a newline)
+_DOUBLED_QUOTE_RE = re.compile(r'\.""(\s*\n)')
+
+# Outermost JSON object embedded in surrounding commentary
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Maximum number of cached LLM responses per analyzer
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# Comma left dangling before a closing bracket
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+# Separator between posts in formatted prompt text
+_POST_SEPARATOR = "\n---\n"
+_TOP_COMMENTS_HEADER = "\nTop Comments:\n"
+
+# Prompt budget for formatted posts, estimated at ~4 characters per token
+_CHARS_PER_TOKEN = 4
+_POSTS_TOKEN_BUDGET = 12_000
+
+# System prompts (static across requests)
+_PAIN_POINTS_SYSTEM_PROMPT = (
+    "You are an expert at analyzing community discussions and identifying key pain points "
+    "with their solutions. Return structured JSON data."
+)
+
+_CONTENT_IDEAS_SYSTEM_PROMPT = (
+    "You are an expert content strategist who creates engaging content ideas based on "
+    "community insights. Return structured JSON data."
+)
+
+_DETAILED_CONTEXT_SYSTEM_PROMPT = (
+    "You are an expert Reddit and social media content analyst who provides exhaustive, "
+    "case-study-level analysis. You extract maximum context and nuance from discussions to "
+    "enable high-quality content generation downstream."
+)
+
+# Static task instructions, sent ahead of the variable data so the prompt
+# prefix is byte-identical across requests (enables provider prefix caching)
+_DATA_DELIMITER = "\n\n===DATA===\n"
+
+_PAIN_POINTS_TASK = """TASK: Analyze the Reddit discussions in the data section and identify the TOP 10 pain points that people are discussing.
+
+For EACH pain point:
+1. Describe the pain point clearly
+2. Summarize the TOP community-voted solutions (based on upvotes and quality)
+3. Note the general sentiment/priority
+
+IMPORTANT: Only include pain points that are DIRECTLY related to the search query given in the data section.
+Ignore tangential discussions or unrelated topics that may have appeared in search results.
+
+Return your analysis as a JSON object with a "pain_points" array containing up to 10 pain point objects."""
+
+_CONTENT_IDEAS_TASK = """TASK: Based on the Reddit research in the data section (search query, identified pain points or top keywords, and sample discussions), generate 10 compelling content ideas.
+
+For EACH content idea, provide:
+1. A compelling title
+2. A brief description of what the content would cover
+3. Why this would be valuable based on the Reddit insights
+
+IMPORTANT: Only generate content ideas that are DIRECTLY related to the search query.
+Do not include ideas about unrelated topics that happened to appear in the data.
+
+Return your analysis as a JSON object with a "content_ideas" array containing up to 10 content ideas."""
+
+_DETAILED_CONTEXT_TASK = """TASK: You are analyzing Reddit discussions to provide exhaustive context for the content idea given at the end of the data section.
+
+Provide a comprehensive, case-study-level analysis of the Reddit discussions in the data section. This analysis will be the ONLY context available to downstream content generators (LinkedIn posts, Twitter threads, blog articles), so it must be extremely detailed and capture ALL relevant information.
+
+**Analysis Requirements:**
+
+1. **Full Post & Comment Analysis** (Most Important):
+   - Transform the Reddit data into a richly detailed narrative
+   - Go far beyond summarization — provide point-by-point contextualized analysis
+   - Capture: motivations, challenges, debates, opposing viewpoints, technical/cultural context
+   - Document: recurring issues, sentiment shifts, community consensus, minority opinions
+   - Include: specific examples, quotes (paraphrased), concrete scenarios
+   - Identify: underlying problems, attempted solutions, what worked/didn't work
+   - Write like a comprehensive case study that could stand alone
+   - Minimum 500 words, maximum 2000 words
+
+2. **Emotional Aspect**: 
+   - Identify the dominant emotional tone (e.g., "frustrated", "excited", "concerned", "hopeful", "angry", "curious")
+
+3. **Controversial Aspect**:
+   - Determine if the topic is controversial
+   - If yes, estimate the split (e.g., "60% supportive, 40% critical")
+
+4. **Engagement Signals**:
+   - Assess popularity level ("high", "medium", "low")
+   - Estimate virality potential ("high", "medium", "low")
+
+5. **Knowledge Depth**:
+   - Classify as "beginner-friendly", "intermediate", or "expert"
+
+6. **Category**:
+   - Primary content category (e.g., "Tutorial", "Opinion", "Analysis", "Case Study", "Guide", "News", "Discussion")
+
+Focus on extracting maximum value and context from the Reddit discussions."""
+
+# Plain JSON mode for models without json_schema support
+_JSON_OBJECT_RESPONSE_FORMAT: Dict[str, Any] = {"type": "json_object"}
+
+# JSON schemas for structured output, shared across requests
+_PAIN_POINTS_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "pain_points_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "pain_points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "description": {
+                                "type": "string",
+                                "description": "Clear description of the pain point"
+                            },
+                            "solution_summary": {
+                                "type": "string",
+                                "description": "Summary of top-voted community solutions"
+                            },
+                            "upvotes": {
+                                "type": "integer",
+                                "description": "Total upvotes for related posts"
+                            }
+                        },
+                        "required": ["description", "solution_summary", "upvotes"],
+                        "additionalProperties": False
+                    },
+                    "maxItems": 10
+                }
+            },
+            "required": ["pain_points"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_CONTENT_IDEAS_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "content_ideas_generation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "content_ideas": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {
+                                "type": "string",
+                                "description": "Compelling content title"
+                            },
+                            "description": {
+                                "type": "string",
+                                "description": "Brief description of content coverage"
+                            },
+                            "rationale": {
+                                "type": "string",
+                                "description": "Why this is valuable based on insights"
+                            }
+                        },
+                        "required": ["title", "description", "rationale"],
+                        "additionalProperties": False
+                    },
+                    "maxItems": 10
+                }
+            },
+            "required": ["content_ideas"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_DETAILED_CONTEXT_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "detailed_context_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "idea_title": {
+                    "type": "string",
+                    "description": "The content idea title"
+                },
+                "idea_description": {
+                    "type": "string",
+                    "description": "Brief description of the idea"
+                },
+                "full_post_and_comment_analysis": {
+                    "type": "string",
+                    "description": "Exhaustive case-study-like narrative analysis (500-2000 words)"
+                },
+                "emotional_aspect": {
+                    "type": "string",
+                    "description": "Dominant emotional tone"
+                },
+                "controversial_aspect": {
+                    "type": "object",
+                    "properties": {
+                        "is_controversial": {
+                            "type": "boolean",
+                            "description": "Whether the topic is controversial"
+                        },
+                        "for_against_split": {
+                            "type": "string",
+                            "description": "Percentage split if controversial"
+                        }
+                    },
+                    "required": ["is_controversial", "for_against_split"],
+                    "additionalProperties": False
+                },
+                "engagement_signals": {
+                    "type": "object",
+                    "properties": {
+                        "popularity": {
+                            "type": "string",
+                            "description": "Popularity level: high, medium, or low"
+                        },
+                        "virality_potential": {
+                            "type": "string",
+                            "description": "Virality potential: high, medium, or low"
+                        }
+                    },
+                    "required": ["popularity", "virality_potential"],
+                    "additionalProperties": False
+                },
+                "knowledge_depth": {
+                    "type": "string",
+                    "description": "Target audience level: beginner-friendly, intermediate, or expert"
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Primary content category"
+                }
+            },
+            "required": [
+                "idea_title",
+                "idea_description",
+                "full_post_and_comment_analysis",
+                "emotional_aspect",
+                "controversial_aspect",
+                "engagement_signals",
+                "knowledge_depth",
+                "category"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+def _repair_json(text: str) -> str:
+    """Repair common LLM JSON glitches so the text can be parsed.
+
+    Drops trailing commas before closing brackets and closes an unterminated
+    string plus any brackets left open by a truncated response.
+
+    Args:
+        text: JSON text starting at its opening bracket
+
+    Returns:
+        Repaired JSON text
+    """
+    text = _TRAILING_COMMA_RE.sub(r"\1", text)
+
+    closers: List[str] = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        elif char in "}]" and closers:
+            closers.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(closers))
+
 
 @dataclass
 class PainPoint:
     """A pain point identified from Reddit discussions."""
 
+    __slots__ = ("description", "solution_summary", "upvotes")
+
     description: str
     solution_summary: str
     upvotes: int
@@ -22,6 +347,8 @@ class PainPoint:
 class ContentIdea:
     """Content idea generated from Reddit insights."""
 
+    __slots__ = ("title", "description", "rationale")
+
     title: str
     description: str
     rationale: str
@@ -31,6 +358,17 @@ class ContentIdea:
 class DetailedContext:
     """Detailed context for a specific content idea."""
 
+    __slots__ = (
+        "idea_title",
+        "idea_description",
+        "full_post_and_comment_analysis",
+        "emotional_aspect",
+        "controversial_aspect",
+        "engagement_signals",
+        "knowledge_depth",
+        "category",
+    )
+
     idea_title: str
     idea_description: str
     full_post_and_comment_analysis: str
@@ -41,67 +379,255 @@ class DetailedContext:
     category: str
 
 
+# Extractors for the required fields, in dataclass positional order
+_PAIN_POINT_FIELDS = itemgetter("description", "solution_summary")
+_CONTENT_IDEA_FIELDS = itemgetter("title", "description", "rationale")
+
+
 class LLMAnalyzer:
     """OpenRouter LLM analyzer using Minimax M2.1 model."""
 
-    def __init__(self, api_key: str, model: str = "minimax/minimax-m2.1"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "minimax/minimax-m2.1",
+        supports_json_schema: bool = True,
+        require_schema_providers: bool = False,
+        max_concurrency: int = 8,
+        requests_per_second: float = 2.0,
+    ):
         """Initialize LLM analyzer.
 
         Args:
             api_key: OpenRouter API key
             model: OpenRouter model to use (defaults to minimax/minimax-m2.1)
+            supports_json_schema: Whether the model honors ``json_schema`` response
+                formats. If False, requests use ``json_object`` mode and carry the
+                schema as a compact instruction in the system prompt instead.
+            require_schema_providers: Only route ``json_schema`` requests to
+                providers that support ``response_format`` (OpenRouter
+                ``require_parameters``). Leave off unless the model has such a
+                provider, or every request fails with no available endpoints.
+            max_concurrency: Maximum number of in-flight OpenRouter requests
+            requests_per_second: Sustained OpenRouter request rate (bursts up to
+                ``max_concurrency`` requests are allowed)
         """
         self.api_key = api_key
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self.model = model
-        self.client = httpx.AsyncClient(timeout=120.0)
+        self.supports_json_schema = supports_json_schema
+        self.require_schema_providers = require_schema_providers
+        # Created on first request so it binds to the loop the analyzer runs on
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # Bound concurrency and request rate to avoid OpenRouter 429s under fan-out.
+        # The semaphore is created on first request so it binds to the running
+        # loop (on Python 3.9 it binds to get_event_loop() when constructed).
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.rate_limiter = TokenBucketRateLimiter(
+            rate_per_second=requests_per_second, burst=max_concurrency
+        )
+
+        # Built once and sent with every request
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/findyourn/reddit-listener",
+        }
+
+        # Response cache: request digest -> (timestamp, content), in LRU order
+        self._response_cache: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._response_cache_ttl = 6 * 60 * 60  # 6 hours in seconds
 
-    @async_retry_with_backoff(
-        max_retries=3,
-        retryable_exceptions=(httpx.HTTPError, httpx.TimeoutException),
-    )
     async def _make_request(
         self, 
         messages: List[Dict[str, str]], 
+        build: Callable[[Any], T],
         temperature: float = 0.7,
-        response_format: Dict[str, Any] = None
+        response_format: Dict[str, Any] = None,
+        timeout: Optional[httpx.Timeout] = None,
+    ) -> T:
+        """Make a request to OpenRouter API, serving repeats from the response cache.
+
+        The response is parsed as JSON and passed to ``build``. Only responses
+        that parse and build successfully are cached, so truncated or malformed
+        output is never replayed. The cache is checked before any retry/backoff
+        handling, so a hit never touches the network.
+
+        Args:
+            messages: List of message objects with role and content
+            build: Converts the parsed JSON into the caller's result type
+            temperature: Sampling temperature
+            response_format: Optional response format specification for structured output
+            timeout: Optional per-request timeout overriding the client default
+
+        Returns:
+            Result of ``build`` for the model's response
+
+        Raises:
+            orjson.JSONDecodeError: If the response is not valid JSON
+            KeyError, TypeError, AttributeError: If ``build`` rejects the data
+        """
+        cache_key = hashlib.blake2b(
+            orjson.dumps((self.model, messages, temperature, response_format))
+        ).digest()
+        cached = self._response_cache.get(cache_key)
+        if cached:
+            del self._response_cache[cache_key]
+            if time.time() - cached[0] <= self._response_cache_ttl:
+                try:
+                    result = build(self._parse_json_response(cached[1]))
+                except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+                    pass  # Leave the entry dropped and fetch a fresh sample
+                else:
+                    self._response_cache[cache_key] = cached
+                    return result
+
+        content = await self._fetch_completion(messages, temperature, response_format, timeout)
+
+        try:
+            result = build(self._parse_json_response(content))
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+            logger.debug("Raw response that failed to parse: %s", content)
+            raise
+
+        self._response_cache[cache_key] = (time.time(), content)
+        self._clean_expired_response_cache()
+        # Evict least recently used entries beyond the size cap
+        while len(self._response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+        return result
+
+    @async_retry_with_backoff(
+        max_retries=3,
+        base_delay=0.5,
+        max_delay=10.0,
+        retryable_exceptions=(httpx.HTTPError, httpx.TimeoutException),
+    )
+    async def _fetch_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        response_format: Optional[Dict[str, Any]],
+        timeout: Optional[httpx.Timeout],
     ) -> str:
-        """Make a request to OpenRouter API.
+        """Fetch a completion from OpenRouter over the network.
 
         Args:
             messages: List of message objects with role and content
             temperature: Sampling temperature
             response_format: Optional response format specification for structured output
+            timeout: Optional per-request timeout overriding the client default
 
         Returns:
             Response content from the model
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/findyourn/reddit-listener",
-        }
-
         payload = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
+            "stream": True,
         }
         
         # Add response_format if provided
         if response_format:
+            if response_format.get("type") == "json_schema":
+                if self.supports_json_schema:
+                    if self.require_schema_providers:
+                        # Only route to providers that enforce the schema while decoding
+                        payload["provider"] = {"require_parameters": True}
+                else:
+                    payload["messages"] = self._embed_schema_in_messages(
+                        messages, response_format
+                    )
+                    response_format = _JSON_OBJECT_RESPONSE_FORMAT
             payload["response_format"] = response_format
 
-        response = await self.client.post(
+        # Stream the completion as server-sent events so the read timeout applies
+        # between chunks rather than to the whole (potentially long) generation
+        content_parts: List[str] = []
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        await self.rate_limiter.acquire()
+        async with self._semaphore, self._get_client().stream(
+            "POST",
             self.base_url,
-            headers=headers,
-            json=payload,
-        )
+            headers=self._headers,
+            content=orjson.dumps(payload),
+            timeout=timeout or _DEFAULT_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                # Skip blank lines and SSE comments (OpenRouter keep-alives)
+                if not line.startswith("data:"):
+                    continue
+
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+
+                event = orjson.loads(data)
+                if "error" in event:
+                    raise httpx.HTTPError(f"OpenRouter stream error: {event['error']}")
+
+                choices = event.get("choices")
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        content_parts.append(delta)
+
+        return "".join(content_parts)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get this analyzer's connection-pooled HTTP client, creating it if needed.
+
+        Reusing one client keeps TLS connections alive between the sequential
+        pain-point, content-idea and detailed-context requests.
+        """
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                http2=True, timeout=_DEFAULT_TIMEOUT, limits=_HTTP_LIMITS
+            )
+        return self.client
+
+    def _clean_expired_response_cache(self) -> None:
+        """Remove expired entries from the response cache."""
+        current_time = time.time()
+        expired_keys = [
+            key
+            for key, (timestamp, _) in self._response_cache.items()
+            if current_time - timestamp > self._response_cache_ttl
+        ]
+        for key in expired_keys:
+            del self._response_cache[key]
+
+    def _embed_schema_in_messages(
+        self, messages: List[Dict[str, str]], response_format: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """Move a JSON schema into the system prompt for ``json_object`` mode.
+
+        Args:
+            messages: List of message objects with role and content
+            response_format: ``json_schema`` response format to embed
 
-        response.raise_for_status()
-        data = response.json()
+        Returns:
+            Copy of messages with the schema appended to the system message
+        """
+        schema = orjson.dumps(response_format["json_schema"]["schema"]).decode()
+        instruction = f"Return only JSON matching this schema: {schema}"
 
-        return data["choices"][0]["message"]["content"]
+        messages = list(messages)
+        if messages and messages[0]["role"] == "system":
+            messages[0] = {
+                "role": "system",
+                "content": f"{messages[0]['content']}\n\n{instruction}",
+            }
+        else:
+            messages.insert(0, {"role": "system", "content": instruction})
+        return messages
 
     def _extract_json_from_response(self, response: str) -> str:
         """Extract JSON from response, handling markdown code blocks.
@@ -113,222 +639,180 @@ class LLMAnalyzer:
             Cleaned JSON string
         """
         # Remove markdown code blocks if present
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]  # Remove ```json
-        elif response.startswith("```"):
-            response = response[3:]  # Remove ```
-        
-        if response.endswith("```"):
-            response = response[:-3]  # Remove trailing ```
-        
-        response = response.strip()
-        
+        response = (
+            response.strip()
+            .removeprefix("```json")
+            .removeprefix("```")
+            .removesuffix("```")
+            .strip()
+        )
+
         # Fix common JSON issues
         # Fix double quotes at end of strings (e.g., "text."" -> "text.")
-        import re
-        response = re.sub(r'\.""(\s*\n)', r'."\\1', response)
+        response = _DOUBLED_QUOTE_RE.sub(r'."\1', response)
         
         return response
 
+    def _parse_json_response(self, response: str) -> Any:
+        """Parse JSON from a model response, falling back to progressively looser extraction.
+
+        Tries the raw response first, then the response with code fences and
+        common quoting issues cleaned up, then the outermost ``{...}`` block
+        found in any surrounding commentary, and finally a repaired copy of the
+        text from the first ``{`` (trailing commas dropped, truncated strings
+        and brackets closed).
+
+        Args:
+            response: Raw response string
+
+        Returns:
+            Parsed JSON data
+
+        Raises:
+            orjson.JSONDecodeError: If no stage yields valid JSON
+        """
+        try:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
+            pass
+
+        cleaned = self._extract_json_from_response(response)
+        try:
+            return orjson.loads(cleaned)
+        except orjson.JSONDecodeError as e:
+            error = e
+
+        match = _JSON_OBJECT_RE.search(cleaned)
+        if match:
+            try:
+                return orjson.loads(match.group(0))
+            except orjson.JSONDecodeError:
+                pass
+
+        start = cleaned.find("{")
+        if start == -1:
+            raise error
+        return orjson.loads(_repair_json(cleaned[start:]))
+
     async def analyze_pain_points(
-        self, query: str, posts_data: List[Dict[str, Any]]
+        self,
+        query: str,
+        posts_data: List[Dict[str, Any]],
+        posts_text: Optional[str] = None,
     ) -> List[PainPoint]:
         """Analyze Reddit posts to extract pain points and solutions.
 
         Args:
             query: Original search query for relevance filtering
             posts_data: List of post data with title, body, comments, upvotes
+            posts_text: Pre-formatted posts (from ``_format_posts_for_analysis``)
+                to reuse across calls; formatted from ``posts_data`` if omitted
 
         Returns:
             List of top 10 pain points with community solutions
         """
         # Format posts for the prompt
-        posts_text = self._format_posts_for_analysis(posts_data)
-
-        prompt = f"""Analyze the following Reddit discussions and identify the TOP 10 pain points that people are discussing.
-
-For EACH pain point:
-1. Describe the pain point clearly
-2. Summarize the TOP community-voted solutions (based on upvotes and quality)
-3. Note the general sentiment/priority
-
-IMPORTANT: Only include pain points that are DIRECTLY related to "{query}". 
-Ignore tangential discussions or unrelated topics that may have appeared in search results.
-
-Reddit Discussions:
-{posts_text}
+        if posts_text is None:
+            posts_text = self._format_posts_for_analysis(posts_data)
 
-Return your analysis as a JSON array containing up to 10 pain point objects."""
+        prompt = (
+            f"{_PAIN_POINTS_TASK}{_DATA_DELIMITER}"
+            f'Search query: "{query}"\n\n'
+            f"Reddit Discussions:\n{posts_text}"
+        )
 
         messages = [
             {
                 "role": "system",
-                "content": "You are an expert at analyzing community discussions and identifying key pain points with their solutions. Return structured JSON data.",
+                "content": _PAIN_POINTS_SYSTEM_PROMPT,
             },
             {"role": "user", "content": prompt},
         ]
 
-        # Define JSON schema for structured output
-        response_format = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "pain_points_analysis",
-                "strict": True,
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "pain_points": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "description": {
-                                        "type": "string",
-                                        "description": "Clear description of the pain point"
-                                    },
-                                    "solution_summary": {
-                                        "type": "string",
-                                        "description": "Summary of top-voted community solutions"
-                                    },
-                                    "upvotes": {
-                                        "type": "integer",
-                                        "description": "Total upvotes for related posts"
-                                    }
-                                },
-                                "required": ["description", "solution_summary", "upvotes"],
-                                "additionalProperties": False
-                            },
-                            "maxItems": 10
-                        }
-                    },
-                    "required": ["pain_points"],
-                    "additionalProperties": False
-                }
-            }
-        }
-
-        response = await self._make_request(messages, temperature=0.3, response_format=response_format)
-
-        # Parse JSON response
-        try:
-            data = json.loads(response)
+        def build(data: Any) -> List[PainPoint]:
             pain_points_data = data.get("pain_points", [])
-            pain_points = [
-                PainPoint(
-                    description=pp["description"],
-                    solution_summary=pp["solution_summary"],
-                    upvotes=pp.get("upvotes", 0),
-                )
+            # The schema isn't always enforced, so upvotes stays optional
+            return [
+                PainPoint(*_PAIN_POINT_FIELDS(pp), pp.get("upvotes", 0))
                 for pp in pain_points_data[:10]
             ]
-            return pain_points
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing pain points response: {e}")
-            print(f"Response: {response}")
+
+        try:
+            return await self._make_request(
+                messages,
+                build,
+                temperature=0.3,
+                response_format=_PAIN_POINTS_RESPONSE_FORMAT,
+            )
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            logger.error("Error parsing pain points response: %s", e)
             return []
 
     async def generate_content_ideas(
-        self, query: str, posts_data: List[Dict[str, Any]], pain_points: List[PainPoint]
+        self,
+        query: str,
+        posts_data: List[Dict[str, Any]],
+        pain_points: Optional[List[PainPoint]] = None,
+        posts_text: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
     ) -> List[ContentIdea]:
         """Generate content ideas based on Reddit insights.
 
+        Either ``pain_points`` or ``keywords`` ground the ideas. Passing keywords
+        lets this run concurrently with ``analyze_pain_points`` instead of
+        waiting for its result.
+
         Args:
             query: Original search query
             posts_data: List of post data
             pain_points: Identified pain points
+            posts_text: Pre-formatted posts (from ``_format_posts_for_analysis``)
+                to reuse across calls; formatted from ``posts_data`` if omitted
+            keywords: Top keywords/phrases, used when pain points are not given
 
         Returns:
             List of up to 10 content ideas
         """
-        posts_text = self._format_posts_for_analysis(posts_data[:50])
-        pain_points_text = "\n".join(
-            [f"- {pp.description}" for pp in pain_points[:10]]
+        if posts_text is None:
+            posts_text = self._format_posts_for_analysis(posts_data)
+
+        if pain_points:
+            insights_heading = "Pain Points Identified"
+            insights = [pp.description for pp in pain_points[:10]]
+        else:
+            insights_heading = "Top Keywords & Phrases"
+            insights = (keywords or [])[:10]
+        insights_text = "\n".join([f"- {insight}" for insight in insights])
+
+        prompt = (
+            f"{_CONTENT_IDEAS_TASK}{_DATA_DELIMITER}"
+            f'Search query: "{query}"\n\n'
+            f"{insights_heading}:\n{insights_text}\n\n"
+            f"Sample Reddit Discussions:\n{posts_text}"
         )
 
-        prompt = f"""Based on the following Reddit research about "{query}", generate 10 compelling content ideas.
-
-Pain Points Identified:
-{pain_points_text}
-
-Sample Reddit Discussions:
-{posts_text}
-
-For EACH content idea, provide:
-1. A compelling title
-2. A brief description of what the content would cover
-3. Why this would be valuable based on the Reddit insights
-
-IMPORTANT: Only generate content ideas that are DIRECTLY related to "{query}".
-Do not include ideas about unrelated topics that happened to appear in the data.
-
-Return your analysis as a JSON object containing up to 10 content ideas."""
-
         messages = [
             {
                 "role": "system",
-                "content": "You are an expert content strategist who creates engaging content ideas based on community insights. Return structured JSON data.",
+                "content": _CONTENT_IDEAS_SYSTEM_PROMPT,
             },
             {"role": "user", "content": prompt},
         ]
 
-        # Define JSON schema for structured output
-        response_format = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "content_ideas_generation",
-                "strict": True,
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "content_ideas": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "title": {
-                                        "type": "string",
-                                        "description": "Compelling content title"
-                                    },
-                                    "description": {
-                                        "type": "string",
-                                        "description": "Brief description of content coverage"
-                                    },
-                                    "rationale": {
-                                        "type": "string",
-                                        "description": "Why this is valuable based on insights"
-                                    }
-                                },
-                                "required": ["title", "description", "rationale"],
-                                "additionalProperties": False
-                            },
-                            "maxItems": 10
-                        }
-                    },
-                    "required": ["content_ideas"],
-                    "additionalProperties": False
-                }
-            }
-        }
-
-        response = await self._make_request(messages, temperature=0.7, response_format=response_format)
+        def build(data: Any) -> List[ContentIdea]:
+            content_ideas_data = data.get("content_ideas", [])
+            # All three fields are required; a missing one raises KeyError
+            return [ContentIdea(*_CONTENT_IDEA_FIELDS(ci)) for ci in content_ideas_data[:10]]
 
-        # Parse JSON response
         try:
-            data = json.loads(response)
-            content_ideas_data = data.get("content_ideas", [])
-            content_ideas = [
-                ContentIdea(
-                    title=ci["title"],
-                    description=ci["description"],
-                    rationale=ci["rationale"],
-                )
-                for ci in content_ideas_data[:10]
-            ]
-            return content_ideas
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing content ideas response: {e}")
-            print(f"Response: {response}")
+            return await self._make_request(
+                messages,
+                build,
+                temperature=0.7,
+                response_format=_CONTENT_IDEAS_RESPONSE_FORMAT,
+            )
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            logger.error("Error parsing content ideas response: %s", e)
             return []
 
     async def generate_detailed_context(
@@ -353,153 +837,51 @@ Return your analysis as a JSON object containing up to 10 content ideas."""
         """
         posts_text = self._format_posts_for_analysis(posts_data, max_posts=100)
 
-        prompt = f"""You are analyzing Reddit discussions to provide exhaustive context for this content idea:
-
-**Content Idea:** {idea_title}
-**Description:** {idea_description}
-
-**Your Task:**
-Provide a comprehensive, case-study-level analysis of the Reddit discussions below. This analysis will be the ONLY context available to downstream content generators (LinkedIn posts, Twitter threads, blog articles), so it must be extremely detailed and capture ALL relevant information.
-
-**Reddit Discussions:**
-{posts_text}
-
-**Analysis Requirements:**
-
-1. **Full Post & Comment Analysis** (Most Important):
-   - Transform the Reddit data into a richly detailed narrative
-   - Go far beyond summarization — provide point-by-point contextualized analysis
-   - Capture: motivations, challenges, debates, opposing viewpoints, technical/cultural context
-   - Document: recurring issues, sentiment shifts, community consensus, minority opinions
-   - Include: specific examples, quotes (paraphrased), concrete scenarios
-   - Identify: underlying problems, attempted solutions, what worked/didn't work
-   - Write like a comprehensive case study that could stand alone
-   - Minimum 500 words, maximum 2000 words
-
-2. **Emotional Aspect**: 
-   - Identify the dominant emotional tone (e.g., "frustrated", "excited", "concerned", "hopeful", "angry", "curious")
-
-3. **Controversial Aspect**:
-   - Determine if the topic is controversial
-   - If yes, estimate the split (e.g., "60% supportive, 40% critical")
-
-4. **Engagement Signals**:
-   - Assess popularity level ("high", "medium", "low")
-   - Estimate virality potential ("high", "medium", "low")
-
-5. **Knowledge Depth**:
-   - Classify as "beginner-friendly", "intermediate", or "expert"
-
-6. **Category**:
-   - Primary content category (e.g., "Tutorial", "Opinion", "Analysis", "Case Study", "Guide", "News", "Discussion")
-
-Focus on extracting maximum value and context from the Reddit discussions."""
+        # Posts come before the idea so the cached prefix also spans the posts
+        # when several ideas are analyzed against the same discovery data
+        prompt = (
+            f"{_DETAILED_CONTEXT_TASK}{_DATA_DELIMITER}"
+            f"**Reddit Discussions:**\n{posts_text}\n\n"
+            f"**Content Idea:** {idea_title}\n"
+            f"**Description:** {idea_description}"
+        )
 
         messages = [
             {
                 "role": "system",
-                "content": "You are an expert Reddit and social media content analyst who provides exhaustive, case-study-level analysis. You extract maximum context and nuance from discussions to enable high-quality content generation downstream.",
+                "content": _DETAILED_CONTEXT_SYSTEM_PROMPT,
             },
             {"role": "user", "content": prompt},
         ]
 
-        # Define JSON schema for structured output
-        response_format = {
-            "type": "json_schema",
-            "json_schema": {
-                "name": "detailed_context_analysis",
-                "strict": True,
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "idea_title": {
-                            "type": "string",
-                            "description": "The content idea title"
-                        },
-                        "idea_description": {
-                            "type": "string",
-                            "description": "Brief description of the idea"
-                        },
-                        "full_post_and_comment_analysis": {
-                            "type": "string",
-                            "description": "Exhaustive case-study-like narrative analysis (500-2000 words)"
-                        },
-                        "emotional_aspect": {
-                            "type": "string",
-                            "description": "Dominant emotional tone"
-                        },
-                        "controversial_aspect": {
-                            "type": "object",
-                            "properties": {
-                                "is_controversial": {
-                                    "type": "boolean",
-                                    "description": "Whether the topic is controversial"
-                                },
-                                "for_against_split": {
-                                    "type": "string",
-                                    "description": "Percentage split if controversial"
-                                }
-                            },
-                            "required": ["is_controversial", "for_against_split"],
-                            "additionalProperties": False
-                        },
-                        "engagement_signals": {
-                            "type": "object",
-                            "properties": {
-                                "popularity": {
-                                    "type": "string",
-                                    "description": "Popularity level: high, medium, or low"
-                                },
-                                "virality_potential": {
-                                    "type": "string",
-                                    "description": "Virality potential: high, medium, or low"
-                                }
-                            },
-                            "required": ["popularity", "virality_potential"],
-                            "additionalProperties": False
-                        },
-                        "knowledge_depth": {
-                            "type": "string",
-                            "description": "Target audience level: beginner-friendly, intermediate, or expert"
-                        },
-                        "category": {
-                            "type": "string",
-                            "description": "Primary content category"
-                        }
-                    },
-                    "required": [
-                        "idea_title",
-                        "idea_description",
-                        "full_post_and_comment_analysis",
-                        "emotional_aspect",
-                        "controversial_aspect",
-                        "engagement_signals",
-                        "knowledge_depth",
-                        "category"
-                    ],
-                    "additionalProperties": False
-                }
-            }
-        }
-
-        response = await self._make_request(messages, temperature=0.5, response_format=response_format)
-
-        # Parse JSON response
-        try:
-            data = json.loads(response)
+        def build(data: Any) -> DetailedContext:
             return DetailedContext(
-                idea_title=data["idea_title"],
-                idea_description=data["idea_description"],
+                idea_title=data.get("idea_title", idea_title),
+                idea_description=data.get("idea_description", idea_description),
                 full_post_and_comment_analysis=data["full_post_and_comment_analysis"],
-                emotional_aspect=data["emotional_aspect"],
-                controversial_aspect=data["controversial_aspect"],
-                engagement_signals=data["engagement_signals"],
-                knowledge_depth=data["knowledge_depth"],
-                category=data["category"],
+                emotional_aspect=data.get("emotional_aspect", "unknown"),
+                controversial_aspect=data.get(
+                    "controversial_aspect",
+                    {"is_controversial": False, "for_against_split": "N/A"},
+                ),
+                engagement_signals=data.get(
+                    "engagement_signals",
+                    {"popularity": "unknown", "virality_potential": "unknown"},
+                ),
+                knowledge_depth=data.get("knowledge_depth", "unknown"),
+                category=data.get("category", "unknown"),
             )
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing detailed context response: {e}")
-            print(f"Response: {response}")
+
+        try:
+            return await self._make_request(
+                messages,
+                build,
+                temperature=0.5,
+                response_format=_DETAILED_CONTEXT_RESPONSE_FORMAT,
+                timeout=_DETAILED_CONTEXT_TIMEOUT,
+            )
+        except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            logger.error("Error parsing detailed context response: %s", e)
             # Return a minimal context on error
             return DetailedContext(
                 idea_title=idea_title,
@@ -513,39 +895,63 @@ Focus on extracting maximum value and context from the Reddit discussions."""
             )
 
     def _format_posts_for_analysis(
-        self, posts_data: List[Dict[str, Any]], max_posts: int = 50
+        self,
+        posts_data: List[Dict[str, Any]],
+        max_posts: int = 50,
+        token_budget: Optional[int] = _POSTS_TOKEN_BUDGET,
     ) -> str:
         """Format posts for LLM analysis.
 
+        Post bodies are capped at 500 characters and, when a token budget is
+        given, trimmed further to keep the text within the budget. Each post gets
+        an even share of whatever budget the earlier posts left unused; titles
+        and comment previews are never trimmed.
+
         Args:
             posts_data: List of post data
             max_posts: Maximum posts to include
+            token_budget: Approximate token budget for the formatted text
+                (None for no budget)
 
         Returns:
             Formatted text
         """
-        formatted = []
-        for i, post in enumerate(posts_data[:max_posts], 1):
-            title = post.get("title", "")
-            body = post.get("body", "")[:500]  # Limit body length
-            upvotes = post.get("upvotes", 0)
-            comments_preview = []
-
-            for comment in post.get("comments", [])[:3]:
-                comments_preview.append(
-                    f"  → {comment.get('body', '')[:200]} (↑{comment.get('upvotes', 0)})"
+        posts = posts_data[:max_posts]
+        remaining = token_budget * _CHARS_PER_TOKEN if token_budget is not None else None
+
+        buf: List[str] = []
+        append = buf.append
+        for i, post in enumerate(posts, 1):
+            get = post.get
+            header = f"\nPost {i}: {get('title', '')} (↑{get('upvotes', 0)})\n"
+            body = get("body", "")[:500]  # Limit body length (no copy if already shorter)
+            comments_text = "\n".join(
+                f"  → {comment.get('body', '')[:200]} (↑{comment.get('upvotes', 0)})"
+                for comment in get("comments", ())[:3]
+            )
+
+            if remaining is not None:
+                share = remaining // (len(posts) - i + 1)
+                overhead = (
+                    len(header) + len(_TOP_COMMENTS_HEADER) + len(comments_text)
+                    + len(_POST_SEPARATOR)
                 )
+                body = body[: max(share - overhead, 0)]
+                remaining -= overhead + len(body)
 
-            post_text = f"""
-Post {i}: {title} (↑{upvotes})
-{body}
-Top Comments:
-{chr(10).join(comments_preview)}
----"""
-            formatted.append(post_text)
+            append(header)
+            append(body)
+            append(_TOP_COMMENTS_HEADER)
+            append(comments_text)
+            append(_POST_SEPARATOR)
 
-        return "\n".join(formatted)
+        # Drop the trailing newline after the last separator
+        if buf:
+            buf[-1] = _POST_SEPARATOR[:-1]
+        return "".join(buf)
 
     async def close(self) -> None:
         """Close the HTTP client."""
-        await self.client.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
@@ -2,6 +2,7 @@
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -69,6 +70,7 @@ class Config:
 
     # Optional fields with defaults
     openrouter_model: str = "minimax/minimax-m2.1"
+    openrouter_require_parameters: bool = False
 
     # Database
     database_path: str = "./data/tokens.db"
@@ -124,6 +126,9 @@ class Config:
         # Optional variables with defaults
         config_values["database_path"] = os.getenv("DATABASE_PATH", "./data/tokens.db")
         config_values["openrouter_model"] = os.getenv("OPENROUTER_MODEL", "minimax/minimax-m2.1")
+        config_values["openrouter_require_parameters"] = os.getenv(
+            "OPENROUTER_REQUIRE_PARAMETERS", ""
+        ).lower() in ("1", "true", "yes")
 
         # Validate encryption key format (should be hex string)
         encryption_key = config_values.get("encryption_key", "")
@@ -141,17 +146,20 @@ class Config:
         return cls(**config_values)
 
 
-# Global config instance (lazy loaded)
-_config: Optional[Config] = None
+@lru_cache(maxsize=2)
+def _load_config(require_slack: bool) -> Config:
+    """Load and cache the configuration for one ``require_slack`` value."""
+    return Config.from_env(require_slack=require_slack)
 
 
 def get_config(require_slack: bool = False) -> Config:
     """Get the global configuration instance.
-    
+
+    The configuration is loaded once per ``require_slack`` value, so a config
+    loaded without Slack validation is never handed to a caller that needs it.
+
     Args:
         require_slack: If True, Slack credentials are required. If False, they're optional.
     """
-    global _config
-    if _config is None:
-        _config = Config.from_env(require_slack=require_slack)
-    return _config
+    # Normalized so positional and keyword calls share one cache entry
+    return _load_config(bool(require_slack))
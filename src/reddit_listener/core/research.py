@@ -1,11 +1,15 @@
 """Core research orchestration."""
 
 import asyncio
+import heapq
+import logging
 import re
 import time
-from collections import Counter
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from asyncpraw.models import Submission
 
@@ -13,6 +17,68 @@ from ..analysis.llm import ContentIdea, LLMAnalyzer, PainPoint
 from ..reddit.client import RedditClient
 from ..reddit.relevance import RelevanceScorer
 
+logger = logging.getLogger(__name__)
+
+# Discovery results kept for phase 2; the oldest entries are dropped first
+_DISCOVERY_CACHE_MAX_ENTRIES = 256
+
+# Comment lists reused across runs for hot posts, keyed by post ID
+_COMMENT_CACHE_MAX_ENTRIES = 2048
+
+# Comment fields sent to the LLM, and the key for picking top comments
+_COMMENT_FIELDS = attrgetter("body", "score")
+_COMMENT_SCORE = attrgetter("score")
+
+# Sentences starting with a question word and ending in "?". A sentence starts
+# at a line start or after ".", "!" or "?" plus whitespace; "." and "!" inside
+# words (e.g. "node.js", "v2.0") don't end it.
+_QUESTION_WORDS = (
+    "what", "why", "how", "when", "where", "who", "which",
+    "can", "should", "would", "is", "are", "do", "does",
+)
+_QUESTION_PATTERN = re.compile(
+    r"(?:^[ \t]*|(?<=[.!?])\s+)"
+    r"((?:" + "|".join(_QUESTION_WORDS) + r")\b(?:[^.!?\n]|[.!](?!\s))*\?)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WORD_PATTERN = re.compile(r"\b[a-z]{3,}\b")
+
+# Common words excluded from keyword extraction (basic stopwords)
+STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "from", "as", "is", "was", "are", "were", "been",
+    "be", "have", "has", "had", "do", "does", "did", "will", "would",
+    "could", "should", "may", "might", "must", "can", "i", "you", "he",
+    "she", "it", "we", "they", "me", "him", "her", "us", "them", "this",
+    "that", "these", "those", "what", "which", "who", "when", "where",
+    "why", "how", "all", "each", "every", "both", "few", "more", "most",
+    "other", "some", "such", "no", "not", "only", "own", "same", "so",
+    "than", "too", "very", "just", "my", "your", "their"
+})
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a search query for cache lookups.
+
+    Reddit search ignores case and extra whitespace, so "AI  tools" and
+    "ai tools" return the same posts and can share cached results.
+
+    Args:
+        query: Search phrase as entered by the user
+
+    Returns:
+        Case-folded query with whitespace collapsed
+    """
+    return " ".join(query.casefold().split())
+
+
+class PostText(NamedTuple):
+    """Text fields of a submission, read once for local insight extraction."""
+
+    title: str
+    body: str
+    score: int
+
 
 @dataclass
 class ResearchResult:
@@ -43,6 +109,7 @@ class DiscoveryCacheEntry:
 
     result: DiscoveryResult
     timestamp: float
+    title_index: Dict[str, ContentIdea]  # Lowercased idea title -> idea
 
 
 class ResearchService:
@@ -58,8 +125,13 @@ class ResearchService:
         self.reddit = reddit_client
         self.llm = llm_analyzer
         self.relevance_scorer = RelevanceScorer(min_threshold=0.3)
-        self._discovery_cache: Dict[str, DiscoveryCacheEntry] = {}
+        # Kept in write order, so the oldest (first to expire) entries come first
+        self._discovery_cache: "OrderedDict[str, DiscoveryCacheEntry]" = OrderedDict()
         self._cache_ttl = 900  # 15 minutes in seconds
+        self._max_comment_fetches = 6  # Concurrent comment fetches per research run
+        self._comment_cache: "OrderedDict[str, Tuple[float, List[Any]]]" = OrderedDict()
+        # Discovery runs in progress, keyed by their arguments
+        self._inflight_discoveries: Dict[Tuple[Any, ...], "asyncio.Future[DiscoveryResult]"] = {}
 
     async def research(
         self,
@@ -81,66 +153,55 @@ class ResearchService:
         Returns:
             Complete research results
         """
-        print(f"Starting research for: {query}")
+        logger.info("Starting research for: %s", query)
+
+        # Fetch Reddit data, scoring each post for relevance as it arrives
+        try:
+            relevant_posts, total_posts = await self.relevance_scorer.filter_stream(
+                self.reddit.search_posts_stream(
+                    query=query,
+                    limit=limit,
+                    time_filter=time_filter,
+                    team_id=team_id,
+                    user_id=user_id,
+                ),
+                query,
+            )
+        except ValueError:
+            raise  # Not authorized; retrying won't help
+        except Exception:
+            # Start over through search_posts(), which retries with backoff
+            logger.warning("Streaming search failed, retrying", exc_info=True)
+            posts = await self.reddit.search_posts(
+                query=query,
+                limit=limit,
+                time_filter=time_filter,
+                team_id=team_id,
+                user_id=user_id,
+            )
+            relevant_posts, _ = await asyncio.to_thread(
+                self.relevance_scorer.filter_posts, posts, query, return_filtered=False
+            )
+            total_posts = len(posts)
 
-        # Fetch Reddit data
-        posts = await self.reddit.search_posts(
-            query=query,
-            limit=limit,
-            time_filter=time_filter,
-            team_id=team_id,
-            user_id=user_id,
+        logger.info("Found %d posts", total_posts)
+        logger.info(
+            "Relevance filtering: %d relevant, %d removed",
+            len(relevant_posts),
+            total_posts - len(relevant_posts),
         )
-
-        print(f"Found {len(posts)} posts")
-
-        # Filter posts for relevance
-        relevant_posts, filtered_out = self.relevance_scorer.filter_posts(posts, query)
-        print(f"Relevance filtering: {len(relevant_posts)} relevant, {len(filtered_out)} removed")
         
         # Extract just the posts from scored results
         posts = [sp.post for sp in relevant_posts]
 
-        # Fetch comments for top posts (in parallel)
-        top_posts = sorted(posts, key=lambda p: p.score, reverse=True)[:20]
-        comment_tasks = [self.reddit.get_post_comments(post, limit=20) for post in top_posts]
-        all_comments = await asyncio.gather(*comment_tasks)
-
-        # Map comments to posts
-        posts_with_comments = []
-        for post, comments in zip(top_posts, all_comments):
-            posts_with_comments.append({"post": post, "comments": comments})
-
-        print(f"Fetched comments for {len(posts_with_comments)} top posts")
-
-        # Extract insights (in parallel)
-        questions_task = asyncio.create_task(self._extract_questions(posts))
-        keywords_task = asyncio.create_task(self._extract_keywords(posts))
-
-        # Prepare data for LLM analysis
-        posts_data = self._prepare_posts_data(posts_with_comments)
-
-        # Run LLM analysis (in parallel)
-        pain_points_task = asyncio.create_task(self.llm.analyze_pain_points(query, posts_data))
-
-        # Wait for all tasks
-        questions = await questions_task
-        keywords = await keywords_task
-        pain_points = await pain_points_task
-
-        print(f"Extracted {len(questions)} questions, {len(keywords)} keywords, {len(pain_points)} pain points")
-
-        # Generate content ideas based on all insights
-        content_ideas = await self.llm.generate_content_ideas(query, posts_data, pain_points)
-
-        print(f"Generated {len(content_ideas)} content ideas")
+        result = await self._analyze_posts(query, posts)
 
         return ResearchResult(
             query=query,
-            questions=questions[:10],
-            keywords=keywords[:10],
-            pain_points=pain_points[:10],
-            content_ideas=content_ideas[:10],
+            questions=result.questions,
+            keywords=result.keywords,
+            pain_points=result.pain_points,
+            content_ideas=result.content_ideas,
         )
 
     async def discover_ideas(
@@ -164,6 +225,8 @@ class ResearchService:
         - Stops early if enough relevant posts are found
         - Reduces unnecessary API calls
 
+        Concurrent calls with the same arguments share a single in-flight run.
+
         Args:
             query: Search phrase to research
             team_id: Slack team ID (optional, for user auth)
@@ -176,7 +239,36 @@ class ResearchService:
         Returns:
             Discovery results with content ideas and cached context data
         """
-        print(f"Starting discovery for: {query}")
+        key = (
+            _normalize_query(query), team_id, user_id, time_filter, limit, batch_size, min_relevant
+        )
+        task = self._inflight_discoveries.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._discover_ideas(
+                    query, team_id, user_id, time_filter, limit, batch_size, min_relevant
+                )
+            )
+            self._inflight_discoveries[key] = task
+            task.add_done_callback(lambda _: self._inflight_discoveries.pop(key, None))
+        else:
+            logger.info("Joining in-flight discovery for: %s", query)
+
+        # Shielded so one cancelled caller doesn't cancel the run for the others
+        return await asyncio.shield(task)
+
+    async def _discover_ideas(
+        self,
+        query: str,
+        team_id: Optional[str],
+        user_id: Optional[str],
+        time_filter: str,
+        limit: int,
+        batch_size: int,
+        min_relevant: int,
+    ) -> DiscoveryResult:
+        """Run the discovery pipeline for discover_ideas() and cache the result."""
+        logger.info("Starting discovery for: %s", query)
 
         # Fetch Reddit data in batches
         all_posts = []
@@ -204,73 +296,52 @@ class ResearchService:
             batches_fetched += 1
             
             # Filter this batch for relevance
-            batch_relevant, _ = self.relevance_scorer.filter_posts(batch_posts, query)
+            batch_relevant, _ = await asyncio.to_thread(
+                self.relevance_scorer.filter_posts, batch_posts, query, return_filtered=False
+            )
             relevant_posts.extend(batch_relevant)
             
-            print(f"Batch {batches_fetched}: fetched {len(batch_posts)} posts, {len(batch_relevant)} relevant (total relevant: {len(relevant_posts)})")
+            logger.info(
+                "Batch %d: fetched %d posts, %d relevant (total relevant: %d)",
+                batches_fetched,
+                len(batch_posts),
+                len(batch_relevant),
+                len(relevant_posts),
+            )
             
             # Stop if we have enough relevant posts
             if len(relevant_posts) >= min_relevant:
-                print(f"Found {len(relevant_posts)} relevant posts - stopping early")
+                logger.info("Found %d relevant posts - stopping early", len(relevant_posts))
                 break
 
-        print(f"Discovery complete: {len(all_posts)} total posts, {len(relevant_posts)} relevant")
+        logger.info(
+            "Discovery complete: %d total posts, %d relevant",
+            len(all_posts),
+            len(relevant_posts),
+        )
         
         # Extract just the posts from scored results
         posts = [sp.post for sp in relevant_posts]
 
-        # Fetch comments for top posts (in parallel)
-        top_posts = sorted(posts, key=lambda p: p.score, reverse=True)[:20]
-        comment_tasks = [self.reddit.get_post_comments(post, limit=20) for post in top_posts]
-        all_comments = await asyncio.gather(*comment_tasks)
-
-        # Map comments to posts
-        posts_with_comments = []
-        for post, comments in zip(top_posts, all_comments):
-            posts_with_comments.append({"post": post, "comments": comments})
-
-        print(f"Fetched comments for {len(posts_with_comments)} top posts")
-
-        # Extract insights (in parallel)
-        questions_task = asyncio.create_task(self._extract_questions(posts))
-        keywords_task = asyncio.create_task(self._extract_keywords(posts))
-
-        # Prepare data for LLM analysis
-        posts_data = self._prepare_posts_data(posts_with_comments)
-
-        # Run LLM analysis (in parallel)
-        pain_points_task = asyncio.create_task(self.llm.analyze_pain_points(query, posts_data))
-
-        # Wait for all tasks
-        questions = await questions_task
-        keywords = await keywords_task
-        pain_points = await pain_points_task
-
-        print(f"Extracted {len(questions)} questions, {len(keywords)} keywords, {len(pain_points)} pain points")
-
-        # Generate content ideas based on all insights
-        content_ideas = await self.llm.generate_content_ideas(query, posts_data, pain_points)
-
-        print(f"Generated {len(content_ideas)} content ideas")
-
-        # Create discovery result with cached posts data
-        result = DiscoveryResult(
-            query=query,
-            content_ideas=content_ideas[:10],
-            pain_points=pain_points[:10],
-            questions=questions[:10],
-            keywords=keywords[:10],
-            _posts_data=posts_data,
-        )
+        # Run the analysis; the result carries posts data for context generation
+        result = await self._analyze_posts(query, posts)
 
-        # Cache the result
-        self._discovery_cache[query] = DiscoveryCacheEntry(
+        # Cache the result (re-inserted so write order matches timestamp order)
+        cache_key = _normalize_query(query)
+        self._discovery_cache.pop(cache_key, None)
+        title_index: Dict[str, ContentIdea] = {}
+        for idea in result.content_ideas:
+            title_index.setdefault(idea.title.lower(), idea)
+        self._discovery_cache[cache_key] = DiscoveryCacheEntry(
             result=result,
             timestamp=time.time(),
+            title_index=title_index,
         )
 
-        # Clean expired cache entries
+        # Clean expired cache entries and cap the size
         self._clean_expired_cache()
+        while len(self._discovery_cache) > _DISCOVERY_CACHE_MAX_ENTRIES:
+            self._discovery_cache.popitem(last=False)
 
         return result
 
@@ -294,7 +365,8 @@ class ResearchService:
         from ..analysis.llm import DetailedContext
 
         # Check cache
-        cache_entry = self._discovery_cache.get(query)
+        cache_key = _normalize_query(query)
+        cache_entry = self._discovery_cache.get(cache_key)
         if not cache_entry:
             raise ValueError(
                 f"No cached discovery data found for query: '{query}'. "
@@ -303,25 +375,23 @@ class ResearchService:
 
         # Check if cache expired
         if time.time() - cache_entry.timestamp > self._cache_ttl:
-            del self._discovery_cache[query]
+            del self._discovery_cache[cache_key]
             raise ValueError(
                 f"Cached discovery data expired for query: '{query}'. "
                 "Please call discover_ideas() again."
             )
 
         # Find the matching content idea to get description
-        matching_idea = None
-        for idea in cache_entry.result.content_ideas:
-            if idea.title == idea_title:
-                matching_idea = idea
-                break
+        title_index = cache_entry.title_index
+        needle = idea_title.lower()
+        matching_idea = title_index.get(needle)
 
         if not matching_idea:
             # Fuzzy match - find closest title
-            for idea in cache_entry.result.content_ideas:
-                if idea_title.lower() in idea.title.lower() or idea.title.lower() in idea_title.lower():
-                    matching_idea = idea
-                    break
+            matching_idea = next(
+                (idea for title, idea in title_index.items() if needle in title or title in needle),
+                None,
+            )
 
         if not matching_idea:
             raise ValueError(
@@ -330,7 +400,7 @@ class ResearchService:
             )
 
         # Generate detailed context
-        print(f"Generating detailed context for idea: {idea_title}")
+        logger.info("Generating detailed context for idea: %s", idea_title)
         detailed_context = await self.llm.generate_detailed_context(
             idea_title=matching_idea.title,
             idea_description=matching_idea.description,
@@ -339,146 +409,215 @@ class ResearchService:
 
         return detailed_context
 
+    async def _analyze_posts(self, query: str, posts: List[Submission]) -> DiscoveryResult:
+        """Fetch comments for top posts and extract insights with keyword and LLM analysis.
+
+        Args:
+            query: Search phrase being researched
+            posts: Relevant Reddit submissions
+
+        Returns:
+            Discovery results with insights and posts data for context generation
+        """
+        # Fetch comments for top posts (in parallel, bounded to keep Reddit load flat)
+        top_posts = heapq.nlargest(20, posts, key=attrgetter("score"))
+
+        # Read each submission's fields once instead of in every extractor
+        post_texts = [
+            PostText(post.title, getattr(post, "selftext", "") or "", post.score)
+            for post in posts
+        ]
+
+        # Extract insights locally while the comments download; the extractors
+        # are CPU-bound, so they run on worker threads to keep the loop free.
+        # Keywords ground the content ideas prompt.
+        all_comments, questions, keywords = await asyncio.gather(
+            self._fetch_comments(top_posts),
+            asyncio.to_thread(self._extract_questions, post_texts),
+            asyncio.to_thread(self._extract_keywords, post_texts),
+        )
+
+        logger.info("Fetched comments for %d top posts", len(top_posts))
+
+        # Prepare data for LLM analysis (formatted once, shared by both prompts)
+        posts_data = self._prepare_posts_data(zip(top_posts, all_comments))
+        posts_text = self.llm._format_posts_for_analysis(posts_data)
+
+        # Run both LLM calls concurrently: content ideas use the extracted keywords
+        # rather than waiting a full round trip for the pain points
+        pain_points, content_ideas = await asyncio.gather(
+            self.llm.analyze_pain_points(query, posts_data, posts_text=posts_text),
+            self.llm.generate_content_ideas(
+                query, posts_data, keywords=keywords, posts_text=posts_text
+            ),
+        )
+
+        logger.info(
+            "Extracted %d questions, %d keywords, %d pain points",
+            len(questions),
+            len(keywords),
+            len(pain_points),
+        )
+        logger.info("Generated %d content ideas", len(content_ideas))
+
+        return DiscoveryResult(
+            query=query,
+            content_ideas=content_ideas[:10],
+            pain_points=pain_points[:10],
+            questions=questions[:10],
+            keywords=keywords[:10],
+            _posts_data=posts_data,
+        )
+
+    async def _fetch_comments(self, posts: List[Submission]) -> List[List[Any]]:
+        """Get comments for posts, reusing cached comments where still fresh.
+
+        Args:
+            posts: Reddit submissions
+
+        Returns:
+            One list of comments per post, in the same order as posts
+        """
+        now = time.time()
+        all_comments: List[Optional[List[Any]]] = []
+        misses = []
+        for post in posts:
+            cached = self._comment_cache.get(post.id)
+            if cached and now - cached[0] <= self._cache_ttl:
+                all_comments.append(cached[1])
+            else:
+                all_comments.append(None)
+                misses.append(post)
+
+        fetched = iter(
+            await self.reddit.get_post_comments_batch(
+                misses, limit=20, concurrency=self._max_comment_fetches
+            )
+        )
+        for i, comments in enumerate(all_comments):
+            if comments is not None:
+                continue
+            comments = all_comments[i] = next(fetched)
+
+            # Empty lists may be transient fetch failures, so they aren't cached
+            if comments:
+                post_id = posts[i].id
+                self._comment_cache.pop(post_id, None)
+                self._comment_cache[post_id] = (time.time(), comments)
+        while len(self._comment_cache) > _COMMENT_CACHE_MAX_ENTRIES:
+            self._comment_cache.popitem(last=False)
+
+        return all_comments
+
     def _clean_expired_cache(self) -> None:
-        """Remove expired entries from discovery cache."""
+        """Remove expired entries from discovery cache.
+
+        Entries are stored oldest first, so the sweep stops at the first live one.
+        """
         current_time = time.time()
-        expired_keys = [
-            key
-            for key, entry in self._discovery_cache.items()
-            if current_time - entry.timestamp > self._cache_ttl
-        ]
-        for key in expired_keys:
+        while self._discovery_cache:
+            key, entry = next(iter(self._discovery_cache.items()))
+            if current_time - entry.timestamp <= self._cache_ttl:
+                break
             del self._discovery_cache[key]
-            print(f"Removed expired cache entry for query: {key}")
+            logger.debug("Removed expired cache entry for query: %s", key)
 
-    async def _extract_questions(self, posts: List[Submission]) -> List[str]:
+    def _extract_questions(self, posts: List[PostText]) -> List[str]:
         """Extract top questions from posts.
 
+        Pure CPU work; call it via ``asyncio.to_thread`` from async code.
+
         Args:
-            posts: List of Reddit submissions
+            posts: Text fields of Reddit submissions
 
         Returns:
             List of top 10 questions
         """
-        questions: List[tuple[str, int]] = []
+        questions: List[Tuple[str, int]] = []
         seen: Set[str] = set()
 
-        # Question patterns
-        question_words = ["what", "why", "how", "when", "where", "who", "which", "can", "should", "would", "is", "are", "do", "does"]
-        question_pattern = re.compile(
-            r"^(" + "|".join(question_words) + r")\b.*\?$",
-            re.IGNORECASE
-        )
+        for title, body, score in posts:
+            # Scan title and selftext (post body) in one pass
+            text = f"{title}\n{body}" if body else title
+            if "?" not in text:
+                continue
 
-        for post in posts:
-            # Check title
-            if "?" in post.title:
-                # Split on sentence boundaries
-                sentences = re.split(r'[.!]\s+', post.title)
-                for sentence in sentences:
-                    sentence = sentence.strip()
-                    if "?" in sentence and question_pattern.match(sentence):
-                        normalized = sentence.lower().strip()
-                        if normalized not in seen and len(sentence) > 10:
-                            questions.append((sentence, post.score))
-                            seen.add(normalized)
-
-            # Check selftext (post body)
-            if hasattr(post, "selftext") and post.selftext:
-                sentences = re.split(r'[.!]\s+', post.selftext)
-                for sentence in sentences:
-                    sentence = sentence.strip()
-                    if "?" in sentence and question_pattern.match(sentence):
-                        normalized = sentence.lower().strip()
-                        if normalized not in seen and len(sentence) > 10:
-                            questions.append((sentence, post.score))
-                            seen.add(normalized)
-
-        # Sort by score (upvotes) and return top 10
-        questions.sort(key=lambda x: x[1], reverse=True)
-        return [q[0] for q in questions[:10]]
-
-    async def _extract_keywords(self, posts: List[Submission]) -> List[str]:
+            for question in _QUESTION_PATTERN.findall(text):
+                if len(question) > 10:
+                    normalized = question.lower()
+                    if normalized not in seen:
+                        questions.append((question, score))
+                        seen.add(normalized)
+
+        # Return the top 10 by score (upvotes)
+        return [q for q, _ in heapq.nlargest(10, questions, key=itemgetter(1))]
+
+    def _extract_keywords(self, posts: List[PostText]) -> List[str]:
         """Extract top keywords and phrases from posts.
 
+        Pure CPU work; call it via ``asyncio.to_thread`` from async code.
+
         Args:
-            posts: List of Reddit submissions
+            posts: Text fields of Reddit submissions
 
         Returns:
             List of top 10 keywords/phrases
         """
-        # Collect all text
-        all_text = []
-        for post in posts:
-            all_text.append(post.title)
-            if hasattr(post, "selftext") and post.selftext:
-                all_text.append(post.selftext[:500])  # Limit length
-
-        combined_text = " ".join(all_text).lower()
-
-        # Remove common words (basic stopwords)
-        stopwords = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-            "of", "with", "by", "from", "as", "is", "was", "are", "were", "been",
-            "be", "have", "has", "had", "do", "does", "did", "will", "would",
-            "could", "should", "may", "might", "must", "can", "i", "you", "he",
-            "she", "it", "we", "they", "me", "him", "her", "us", "them", "this",
-            "that", "these", "those", "what", "which", "who", "when", "where",
-            "why", "how", "all", "each", "every", "both", "few", "more", "most",
-            "other", "some", "such", "no", "not", "only", "own", "same", "so",
-            "than", "too", "very", "just", "my", "your", "their"
-        }
-
-        # Extract words and bigrams
-        words = re.findall(r'\b[a-z]{3,}\b', combined_text)
-        
-        # Count word frequency (excluding stopwords)
-        word_counts = Counter([w for w in words if w not in stopwords])
-
-        # Extract common bigrams (two-word phrases)
-        bigrams = []
-        for i in range(len(words) - 1):
-            if words[i] not in stopwords or words[i + 1] not in stopwords:
-                bigrams.append(f"{words[i]} {words[i + 1]}")
-        
-        bigram_counts = Counter(bigrams)
+        word_counts: Counter = Counter()
+        bigram_counts: Counter = Counter()
+
+        # Scan each title and (length-limited) body on its own, so no large
+        # joined copy is built and bigrams never span two posts
+        for title, body, _ in posts:
+            for text in (title, body[:500]):
+                if not text:
+                    continue
+                words = _WORD_PATTERN.findall(text.lower())
+
+                # Count word frequency (excluding stopwords)
+                word_counts.update(w for w in words if w not in STOPWORDS)
+
+                # Count common bigrams (two-word phrases) as tuples; format only the winners
+                bigram_counts.update(
+                    (first, second)
+                    for first, second in zip(words, islice(words, 1, None))
+                    if first not in STOPWORDS or second not in STOPWORDS
+                )
 
         # Combine and get top keywords
         top_words = [word for word, _ in word_counts.most_common(7)]
-        top_bigrams = [bigram for bigram, _ in bigram_counts.most_common(3)]
+        top_bigrams = [f"{first} {second}" for (first, second), _ in bigram_counts.most_common(3)]
 
         # Mix words and phrases
         keywords = top_bigrams + top_words
         return keywords[:10]
 
     def _prepare_posts_data(
-        self, posts_with_comments: List[Dict[str, Any]]
+        self, posts_with_comments: Iterable[Tuple[Submission, List[Any]]]
     ) -> List[Dict[str, Any]]:
         """Prepare posts data for LLM analysis.
 
         Args:
-            posts_with_comments: List of posts with their comments
+            posts_with_comments: (post, comments) pairs
 
         Returns:
             Formatted data for LLM
         """
-        posts_data = []
-        for item in posts_with_comments:
-            post = item["post"]
-            comments = item["comments"]
-
-            post_data = {
+        # Comments come from a fully loaded tree (replace_more), so every one
+        # has body and score; fetch both in a single C-level call
+        return [
+            {
                 "title": post.title,
                 "body": getattr(post, "selftext", "")[:1000],
                 "upvotes": post.score,
                 "comments": [
-                    {
-                        "body": getattr(comment, "body", "")[:500],
-                        "upvotes": getattr(comment, "score", 0),
-                    }
-                    for comment in comments[:10]
+                    {"body": body[:500], "upvotes": score}
+                    # Keep the highest-voted comments rather than tree order
+                    for body, score in map(
+                        _COMMENT_FIELDS,
+                        heapq.nlargest(10, comments, key=_COMMENT_SCORE),
+                    )
                 ],
             }
-            posts_data.append(post_data)
-
-        return posts_data
+            for post, comments in posts_with_comments
+        ]
@@ -1,7 +1,8 @@
 """Synchronous wrapper for ResearchService for Flask/sync environments."""
 
 import asyncio
-from typing import Optional
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
 
 from ..analysis.llm import DetailedContext, LLMAnalyzer
 from ..config import Config, get_config
@@ -9,12 +10,21 @@ from ..reddit.client import RedditClient
 from ..storage.sqlite import SQLiteTokenStore
 from .research import DiscoveryResult, ResearchResult, ResearchService
 
+try:
+    import uvloop
+except ImportError:  # Optional speedup, not available on Windows
+    uvloop = None
+
+T = TypeVar("T")
+
 
 class SyncResearchService:
     """Synchronous wrapper around ResearchService for Flask and other sync frameworks.
     
     This class provides blocking methods that internally manage the asyncio event loop,
     making it easy to use the Reddit research capabilities in synchronous contexts.
+    The loop runs on a dedicated background thread for the lifetime of the service,
+    so HTTP connections stay warm and the methods can be called from any thread.
     
     Example:
         ```python
@@ -72,53 +82,68 @@ class SyncResearchService:
         self._reddit_redirect_uri = reddit_redirect_uri or config.reddit_redirect_uri
         self._openrouter_api_key = openrouter_api_key or config.openrouter_api_key
         self._openrouter_model = openrouter_model or config.openrouter_model
+        self._openrouter_require_parameters = config.openrouter_require_parameters
         self._encryption_key = encryption_key or config.encryption_key
         self._database_path = database_path or config.database_path
         
         # Initialize async components
-        self._loop = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
         self._service = None
         self._initialized = False
+        self._init_lock = threading.Lock()
 
     def _ensure_initialized(self):
         """Ensure async components are initialized."""
-        if not self._initialized:
-            # Create event loop if needed
-            try:
-                self._loop = asyncio.get_event_loop()
-                if self._loop.is_closed():
-                    self._loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(self._loop)
-            except RuntimeError:
-                self._loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(self._loop)
-            
-            # Initialize async service
-            token_store = SQLiteTokenStore(
-                db_path=self._database_path,
-                encryption_key=self._encryption_key,
-            )
-            
-            reddit_client = RedditClient(
-                client_id=self._reddit_client_id,
-                client_secret=self._reddit_client_secret,
-                user_agent=self._reddit_user_agent,
-                redirect_uri=self._reddit_redirect_uri,
-                token_store=token_store,
-            )
-            
-            llm_analyzer = LLMAnalyzer(
-                api_key=self._openrouter_api_key,
-                model=self._openrouter_model,
-            )
-            
-            self._service = ResearchService(
-                reddit_client=reddit_client,
-                llm_analyzer=llm_analyzer,
+        with self._init_lock:
+            if self._initialized:
+                return
+
+            # One long-lived loop on a background thread serves every call.
+            # The loop is private to this service, so uvloop is used without
+            # installing its policy over the host application's.
+            self._loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="reddit-listener-loop",
+                daemon=True,
             )
-            
+            self._loop_thread.start()
+
+            # Build the async service on the loop so its primitives bind to it
+            self._service = self._run(self._create_service())
             self._initialized = True
 
+    async def _create_service(self) -> ResearchService:
+        """Create the async research service and its clients."""
+        token_store = SQLiteTokenStore(
+            db_path=self._database_path,
+            encryption_key=self._encryption_key,
+        )
+
+        reddit_client = RedditClient(
+            client_id=self._reddit_client_id,
+            client_secret=self._reddit_client_secret,
+            user_agent=self._reddit_user_agent,
+            redirect_uri=self._reddit_redirect_uri,
+            token_store=token_store,
+        )
+
+        llm_analyzer = LLMAnalyzer(
+            api_key=self._openrouter_api_key,
+            model=self._openrouter_model,
+            require_schema_providers=self._openrouter_require_parameters,
+        )
+
+        return ResearchService(
+            reddit_client=reddit_client,
+            llm_analyzer=llm_analyzer,
+        )
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the background loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
     def research(
         self,
         query: str,
@@ -140,7 +165,7 @@ class SyncResearchService:
             Complete research results
         """
         self._ensure_initialized()
-        return self._loop.run_until_complete(
+        return self._run(
             self._service.research(query, team_id, user_id, time_filter, limit)
         )
 
@@ -178,7 +203,7 @@ class SyncResearchService:
             Discovery results with content ideas and cached context data
         """
         self._ensure_initialized()
-        return self._loop.run_until_complete(
+        return self._run(
             self._service.discover_ideas(query, team_id, user_id, time_filter, limit, batch_size, min_relevant)
         )
 
@@ -199,13 +224,24 @@ class SyncResearchService:
             ValueError: If no cached discovery data found for query or if cache expired
         """
         self._ensure_initialized()
-        return self._loop.run_until_complete(
+        return self._run(
             self._service.get_idea_context(query, idea_title)
         )
 
     def close(self):
         """Close all async connections and clean up resources."""
-        if self._service:
-            self._loop.run_until_complete(self._service.reddit.close())
-            self._loop.run_until_complete(self._service.llm.close())
-            self._loop.run_until_complete(self._service.reddit.token_store.close())
+        with self._init_lock:
+            if self._service:
+                self._run(self._service.reddit.close())
+                self._run(self._service.llm.close())
+                self._run(self._service.reddit.token_store.close())
+                self._service = None
+
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join()
+                self._loop.close()
+                self._loop = None
+                self._loop_thread = None
+
+            self._initialized = False
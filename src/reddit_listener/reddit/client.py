@@ -1,17 +1,44 @@
 """Reddit API client with OAuth support."""
 
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlencode
 
 import asyncpraw
+import httpx
+import orjson
 from asyncpraw.models import Submission, Subreddit
 
 from ..storage.base import TokenData, TokenStore
 from .rate_limiter import TokenBucketRateLimiter
 from .retry import async_retry_with_backoff
 
+# How long a token read from the token store is reused before re-reading it.
+# Access-token expiry is still checked on every use.
+_TOKEN_CACHE_TTL = 55 * 60
+
+# OAuth endpoint used to refresh user access tokens
+_ACCESS_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+
+
+# Refresh access tokens this many seconds before they expire
+_REFRESH_MARGIN = 5 * 60
+
+
+class _CachedToken(NamedTuple):
+    """A token store entry with monotonic deadlines for in-process checks."""
+
+    token: TokenData
+    cache_until: float  # When to re-read the token store
+    expires_monotonic: float  # token.expires_at converted to time.monotonic()
+
+
+def _token_is_fresh(token_data: TokenData) -> bool:
+    """Check that a token won't expire within the refresh margin (wall clock)."""
+    return datetime.utcnow() + timedelta(seconds=_REFRESH_MARGIN) < token_data.expires_at
+
 
 class RedditClient:
     """Async Reddit API client with dual authentication modes."""
@@ -45,6 +72,24 @@ class RedditClient:
         # Server-side Reddit instance (for direct backend calls)
         self._server_reddit: Optional[asyncpraw.Reddit] = None
 
+        # Per-user Reddit instances, reused across calls so their HTTP sessions
+        # stay warm. Keyed by (team_id, user_id) -> (instance, refresh_token);
+        # asyncpraw refreshes access tokens itself, so an instance only needs
+        # replacing when the user re-authorizes with a new refresh token.
+        self._user_reddit: Dict[Tuple[str, str], Tuple[asyncpraw.Reddit, str]] = {}
+        # asyncio primitives are created on first use so they bind to the running
+        # loop (on Python 3.9 they bind to get_event_loop() when constructed)
+        self._user_reddit_lock: Optional[asyncio.Lock] = None
+
+        # Tokens read from the token store: (team_id, user_id) -> (token, deadline)
+        self._token_cache: Dict[Tuple[str, str], _CachedToken] = {}
+
+        # HTTP client for OAuth token refreshes (created on first use)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # One refresh at a time per user, so concurrent calls don't race Reddit.
+        # (team_id, user_id) -> (lock, callers using it); dropped when unused.
+        self._refresh_locks: Dict[Tuple[str, str], Tuple[asyncio.Lock, int]] = {}
+
     def get_auth_url(self, state: str) -> str:
         """Generate OAuth authorization URL for user.
 
@@ -75,14 +120,12 @@ class RedditClient:
         Returns:
             TokenData with access and refresh tokens
         """
-        reddit = asyncpraw.Reddit(
+        async with asyncpraw.Reddit(
             client_id=self.client_id,
             client_secret=self.client_secret,
             redirect_uri=self.redirect_uri,
             user_agent=self.user_agent,
-        )
-
-        try:
+        ) as reddit:
             # Exchange code for token
             await reddit.auth.authorize(code)
 
@@ -99,10 +142,47 @@ class RedditClient:
             # Store token
             if self.token_store:
                 await self.token_store.save_token(team_id, user_id, token_data)
+                self._cache_token(team_id, user_id, token_data)
 
             return token_data
-        finally:
-            await reddit.close()
+
+    def _cache_token(self, team_id: str, user_id: str, token_data: TokenData) -> None:
+        """Remember a user's token so later calls skip the token store.
+
+        Args:
+            team_id: Slack team ID
+            user_id: Slack user ID
+            token_data: Token just read from or written to the token store
+        """
+        now = time.monotonic()
+        # Convert the wall-clock expiry once so refresh checks stay monotonic
+        expires_in = (token_data.expires_at - datetime.utcnow()).total_seconds()
+        self._token_cache[(team_id, user_id)] = _CachedToken(
+            token=token_data,
+            cache_until=now + _TOKEN_CACHE_TTL,
+            expires_monotonic=now + expires_in,
+        )
+
+    async def _get_token(self, team_id: str, user_id: str) -> Optional[TokenData]:
+        """Get a user's token, reading the token store at most once per TTL.
+
+        Args:
+            team_id: Slack team ID
+            user_id: Slack user ID
+
+        Returns:
+            TokenData if the user has authorized Reddit access, None otherwise
+        """
+        cached = self._token_cache.get((team_id, user_id))
+        if cached and time.monotonic() < cached.cache_until:
+            return cached.token
+
+        token_data = await self.token_store.get_token(team_id, user_id)
+        if token_data:
+            self._cache_token(team_id, user_id, token_data)
+        else:
+            self._token_cache.pop((team_id, user_id), None)
+        return token_data
 
     async def _refresh_token_if_needed(
         self, team_id: str, user_id: str, token_data: TokenData
@@ -118,38 +198,92 @@ class RedditClient:
             Updated token data
         """
         # Check if token is expired or will expire soon (within 5 minutes)
-        if datetime.utcnow() + timedelta(minutes=5) < token_data.expires_at:
+        if self._is_fresh(team_id, user_id, token_data):
             return token_data
 
-        # Refresh the token
-        reddit = asyncpraw.Reddit(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            user_agent=self.user_agent,
-            refresh_token=token_data.refresh_token,
-        )
+        key = (team_id, user_id)
+        lock, users = self._refresh_locks.get(key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._refresh_locks[key] = (lock, users + 1)
 
         try:
-            # Refresh will happen automatically on next request
-            await reddit.user.me()
+            async with lock:
+                # Another call may have refreshed the token while this one waited
+                cached = self._token_cache.get(key)
+                if cached and self._is_fresh(team_id, user_id, cached.token):
+                    return cached.token
 
-            expires_at = datetime.utcnow() + timedelta(hours=1)
-            new_token_data = TokenData(
-                access_token=reddit._core._authorizer.access_token,
-                refresh_token=reddit._core._authorizer.refresh_token
-                or token_data.refresh_token,
-                expires_at=expires_at,
-                scope=token_data.scope,
-            )
+                return await self._refresh_token(team_id, user_id, token_data)
+        finally:
+            # Forget the lock once no caller is using it
+            lock, users = self._refresh_locks[key]
+            if users == 1:
+                del self._refresh_locks[key]
+            else:
+                self._refresh_locks[key] = (lock, users - 1)
 
-            # Update stored token
-            if self.token_store:
-                await self.token_store.save_token(team_id, user_id, new_token_data)
+    def _is_fresh(self, team_id: str, user_id: str, token_data: TokenData) -> bool:
+        """Check that a token won't expire within the refresh margin.
 
-            return new_token_data
-        finally:
-            await reddit.close()
+        Cached tokens are checked against their monotonic deadline; tokens not
+        in the cache fall back to comparing wall-clock expires_at.
+
+        Args:
+            team_id: Slack team ID
+            user_id: Slack user ID
+            token_data: Token to check
+
+        Returns:
+            True if the token can be used without refreshing
+        """
+        cached = self._token_cache.get((team_id, user_id))
+        if cached and cached.token is token_data:
+            return time.monotonic() + _REFRESH_MARGIN < cached.expires_monotonic
+        return _token_is_fresh(token_data)
+
+    async def _refresh_token(
+        self, team_id: str, user_id: str, token_data: TokenData
+    ) -> TokenData:
+        """Exchange a refresh token for a new access token and store it.
+
+        Args:
+            team_id: Slack team ID
+            user_id: Slack user ID
+            token_data: Current token data
+
+        Returns:
+            Refreshed token data
+        """
+        # Refresh the token directly against the OAuth endpoint
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0))
+
+        response = await self._http_client.post(
+            _ACCESS_TOKEN_URL,
+            data={"grant_type": "refresh_token", "refresh_token": token_data.refresh_token},
+            auth=(self.client_id, self.client_secret),
+            headers={"User-Agent": self.user_agent},
+        )
+        response.raise_for_status()
+        payload = orjson.loads(response.content)
+        if "error" in payload:
+            raise ValueError(f"Reddit token refresh failed: {payload['error']}")
+
+        expires_at = datetime.utcnow() + timedelta(seconds=payload.get("expires_in", 3600))
+        new_token_data = TokenData(
+            access_token=payload["access_token"],
+            refresh_token=payload.get("refresh_token") or token_data.refresh_token,
+            expires_at=expires_at,
+            scope=payload.get("scope", token_data.scope),
+        )
+
+        # Update stored token
+        if self.token_store:
+            await self.token_store.save_token(team_id, user_id, new_token_data)
+            self._cache_token(team_id, user_id, new_token_data)
+
+        return new_token_data
 
     async def _get_user_reddit(self, team_id: str, user_id: str) -> asyncpraw.Reddit:
         """Get Reddit instance for a specific user.
@@ -167,8 +301,13 @@ class RedditClient:
         if not self.token_store:
             raise ValueError("Token store not configured")
 
-        token_data = await self.token_store.get_token(team_id, user_id)
+        key = (team_id, user_id)
+        token_data = await self._get_token(team_id, user_id)
         if not token_data:
+            # Access was revoked; drop any instance built from the old token
+            cached = self._user_reddit.pop(key, None)
+            if cached:
+                await cached[0].close()
             raise ValueError(
                 "User has not authorized Reddit access. Use /connect-reddit first."
             )
@@ -176,13 +315,24 @@ class RedditClient:
         # Refresh token if needed
         token_data = await self._refresh_token_if_needed(team_id, user_id, token_data)
 
-        return asyncpraw.Reddit(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            user_agent=self.user_agent,
-            refresh_token=token_data.refresh_token,
-        )
+        if self._user_reddit_lock is None:
+            self._user_reddit_lock = asyncio.Lock()
+        async with self._user_reddit_lock:
+            cached = self._user_reddit.get(key)
+            if cached and cached[1] == token_data.refresh_token:
+                return cached[0]
+            if cached:
+                await cached[0].close()
+
+            reddit = asyncpraw.Reddit(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                redirect_uri=self.redirect_uri,
+                user_agent=self.user_agent,
+                refresh_token=token_data.refresh_token,
+            )
+            self._user_reddit[key] = (reddit, token_data.refresh_token)
+            return reddit
 
     async def _get_server_reddit(self) -> asyncpraw.Reddit:
         """Get server-side Reddit instance (for backend calls).
@@ -227,42 +377,97 @@ class RedditClient:
         Returns:
             List of Reddit submissions
         """
-        await self.rate_limiter.acquire()
+        return [
+            submission
+            async for submission in self.search_posts_stream(
+                query,
+                limit=limit,
+                time_filter=time_filter,
+                team_id=team_id,
+                user_id=user_id,
+                subreddits=subreddits,
+                skip=skip,
+            )
+        ]
+
+    async def search_posts_stream(
+        self,
+        query: str,
+        limit: int = 100,
+        time_filter: str = "month",
+        team_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        subreddits: Optional[List[str]] = None,
+        skip: int = 0,
+    ) -> AsyncIterator[Submission]:
+        """Search Reddit posts, yielding each one as soon as it is parsed.
+
+        Lets callers process a listing page while the next one is fetched.
+        Unlike search_posts(), errors are not retried: posts may already have
+        been yielded, so the caller decides whether to start over.
+
+        Args:
+            query: Search query
+            limit: Maximum number of posts to yield
+            time_filter: Time filter (hour, day, week, month, year, all)
+            team_id: Slack team ID (for user auth)
+            user_id: Slack user ID (for user auth)
+            subreddits: Optional list of specific subreddits to search
+            skip: Number of posts to skip (for pagination)
+
+        Yields:
+            Reddit submissions in search order
+        """
+        subreddit = await self._search_subreddit(team_id, user_id, subreddits)
+        end = limit + skip
+        position = 0
+
+        async for submission in subreddit.search(query, time_filter=time_filter, limit=end):
+            position += 1
+            # Skip posts if pagination is requested
+            if position <= skip:
+                continue
 
+            yield submission
+
+            # Stop as soon as the window is full, without waiting on the listing
+            if position >= end:
+                break
+
+    async def _search_subreddit(
+        self,
+        team_id: Optional[str],
+        user_id: Optional[str],
+        subreddits: Optional[List[str]],
+    ) -> Subreddit:
+        """Get the (multi-)subreddit to search, after waiting for a rate-limit token.
+
+        Args:
+            team_id: Slack team ID (for user auth)
+            user_id: Slack user ID (for user auth)
+            subreddits: Optional list of specific subreddits; None means r/all
+
+        Returns:
+            Subreddit to run the search against
+        """
         # Use user auth if provided, otherwise server auth
         if team_id and user_id:
-            reddit = await self._get_user_reddit(team_id, user_id)
+            get_reddit = self._get_user_reddit(team_id, user_id)
         else:
-            reddit = await self._get_server_reddit()
+            get_reddit = self._get_server_reddit()
 
-        try:
-            # Determine subreddit(s) to search
-            if subreddits:
-                # Join multiple subreddits with + (e.g., "python+learnprogramming")
-                subreddit_name = "+".join(subreddits)
-            else:
-                # Search all subreddits
-                subreddit_name = "all"
-            
-            subreddit = await reddit.subreddit(subreddit_name)
-            posts = []
-            count = 0
-
-            async for submission in subreddit.search(
-                query, time_filter=time_filter, limit=limit + skip
-            ):
-                # Skip posts if pagination is requested
-                if count < skip:
-                    count += 1
-                    continue
-                    
-                posts.append(submission)
-
-            return posts
-        finally:
-            # Only close if it's a user-specific instance
-            if team_id and user_id:
-                await reddit.close()
+        # The token lookup doesn't depend on the rate limiter, so wait for both at once
+        _, reddit = await asyncio.gather(self.rate_limiter.acquire(), get_reddit)
+
+        # Determine subreddit(s) to search
+        if subreddits:
+            # Join multiple subreddits with + (e.g., "python+learnprogramming")
+            subreddit_name = "+".join(subreddits)
+        else:
+            # Search all subreddits
+            subreddit_name = "all"
+
+        return await reddit.subreddit(subreddit_name)
 
     async def get_post_comments(
         self,
@@ -296,8 +501,52 @@ class RedditClient:
             # Silently skip posts without accessible comments
             return []
 
+    async def get_post_comments_batch(
+        self,
+        posts: List[Submission],
+        limit: int = 50,
+        concurrency: int = 8,
+    ) -> List[List]:
+        """Get comments for several posts with bounded concurrency.
+
+        The shared rate limiter still paces requests; the semaphore only caps
+        how many fetches are in flight at once.
+
+        Args:
+            posts: Reddit submissions
+            limit: Maximum number of comments to fetch per post
+            concurrency: Maximum number of posts fetched at the same time
+
+        Returns:
+            One list of comments per post, in the same order as posts
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(post: Submission) -> List:
+            async with semaphore:
+                return await self.get_post_comments(post, limit=limit)
+
+        return list(await asyncio.gather(*(fetch(post) for post in posts)))
+
     async def close(self) -> None:
         """Close all Reddit connections."""
         if self._server_reddit:
             await self._server_reddit.close()
             self._server_reddit = None
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+        user_instances = list(self._user_reddit.values())
+        self._user_reddit.clear()
+        for reddit, _ in user_instances:
+            await reddit.close()
+
+    async def __aenter__(self) -> "RedditClient":
+        """Use the client as an async context manager that closes on exit."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close all Reddit connections."""
+        await self.close()
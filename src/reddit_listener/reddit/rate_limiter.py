@@ -2,11 +2,16 @@
 
 import asyncio
 import time
-from typing import Optional
 
 
 class TokenBucketRateLimiter:
-    """Token bucket algorithm for rate limiting with burst support."""
+    """Token bucket algorithm for rate limiting with burst support.
+
+    Callers reserve tokens up front: when the bucket is short, the balance goes
+    negative and each caller sleeps only until its own reservation is covered.
+    Waiters therefore sleep concurrently instead of queueing on a lock, while
+    the overall rate and FIFO spacing are unchanged.
+    """
 
     def __init__(self, rate_per_second: float = 1.0, burst: int = 10):
         """Initialize rate limiter.
@@ -19,7 +24,6 @@ class TokenBucketRateLimiter:
         self.burst = burst
         self.tokens = float(burst)
         self.last_update = time.monotonic()
-        self._lock = asyncio.Lock()
 
     async def acquire(self, tokens: int = 1) -> None:
         """Acquire tokens, waiting if necessary.
@@ -27,21 +31,25 @@ class TokenBucketRateLimiter:
         Args:
             tokens: Number of tokens to acquire (default 1)
         """
-        async with self._lock:
-            now = time.monotonic()
-
-            # Add tokens based on time elapsed
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
-            self.last_update = now
-
-            # If we have enough tokens, consume and return
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return
-
-            # Wait for tokens to be available
-            wait_time = (tokens - self.tokens) / self.rate
+        # No await happens until the reservation is recorded, so concurrent
+        # callers on the event loop can't interleave here
+        now = time.monotonic()
+
+        # Add tokens based on time elapsed
+        elapsed = now - self.last_update
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.last_update = now
+
+        # Reserve the tokens; a negative balance is owed to earlier waiters
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return
+
+        # Wait until the refill covers this reservation
+        wait_time = -self.tokens / self.rate
+        try:
             await asyncio.sleep(wait_time)
-            self.tokens = 0
-            self.last_update = time.monotonic()
+        except asyncio.CancelledError:
+            # Give the unused reservation back to later callers
+            self.tokens = min(self.burst, self.tokens + tokens)
+            raise
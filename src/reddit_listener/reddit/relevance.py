@@ -2,7 +2,10 @@
 
 import re
 from dataclasses import dataclass
-from typing import Any, List, Tuple
+from typing import Any, AsyncIterable, FrozenSet, List, NamedTuple, Tuple
+
+# Whole lowercase ASCII words; the \b anchors drop fragments such as "caf" in "café"
+_WORD_PATTERN = re.compile(r"\b[a-z]+\b")
 
 
 @dataclass
@@ -14,6 +17,19 @@ class ScoredPost:
     match_reasons: List[str]
 
 
+def _rank_key(scored_post: "ScoredPost") -> float:
+    """Combined ranking: relevance score weighted by upvotes."""
+    return scored_post.relevance_score * max(getattr(scored_post.post, "score", 1), 1)
+
+
+class _QueryFeatures(NamedTuple):
+    """Query-derived values shared by every post scored against one query."""
+
+    words: FrozenSet[str]
+    phrases: Tuple[str, ...]
+    condensed_phrases: Tuple[str, ...]  # Phrases without spaces, for subreddit names
+
+
 class RelevanceScorer:
     """Scores posts for relevance to a query."""
 
@@ -33,16 +49,43 @@ class RelevanceScorer:
             post: Reddit submission
             query: User's search query
 
+        Returns:
+            ScoredPost with relevance score and match reasons
+        """
+        return self._score_post(post, self._prepare_query(query))
+
+    def _prepare_query(self, query: str) -> _QueryFeatures:
+        """Normalize a query once for scoring many posts against it.
+
+        Args:
+            query: User's search query
+
+        Returns:
+            Query words, phrases and space-free phrases
+        """
+        query_lower = query.lower().strip()
+        phrases = tuple(self._extract_phrases(query_lower))
+        return _QueryFeatures(
+            words=frozenset(query_lower.split()),
+            phrases=phrases,
+            condensed_phrases=tuple(phrase.replace(" ", "") for phrase in phrases),
+        )
+
+    def _score_post(self, post: Any, features: _QueryFeatures) -> ScoredPost:
+        """Score a single post against a prepared query.
+
+        Args:
+            post: Reddit submission
+            features: Query features from _prepare_query()
+
         Returns:
             ScoredPost with relevance score and match reasons
         """
         score = 0.0
         reasons = []
 
-        # Normalize query and content
-        query_lower = query.lower().strip()
-        query_words = set(query_lower.split())
-        query_phrases = self._extract_phrases(query_lower)
+        query_words = features.words
+        query_phrases = features.phrases
 
         title = getattr(post, "title", "").lower()
         body = getattr(post, "selftext", "").lower() if hasattr(post, "selftext") else ""
@@ -62,7 +105,7 @@ class RelevanceScorer:
                 break
 
         # 3. All query words appear in title (weight: 0.3)
-        title_words = set(re.findall(r'\b[a-z]+\b', title))
+        title_words = set(_WORD_PATTERN.findall(title))
         if query_words and query_words.issubset(title_words):
             score += 0.3
             reasons.append("All query words in title")
@@ -75,7 +118,7 @@ class RelevanceScorer:
                 reasons.append(f"Partial match: {len(matching_words)}/{len(query_words)} words")
 
         # 5. All query words in body (weight: 0.15)
-        body_words = set(re.findall(r'\b[a-z]+\b', body))
+        body_words = set(_WORD_PATTERN.findall(body))
         if query_words and query_words.issubset(body_words):
             score += 0.15
             reasons.append("All query words in body")
@@ -84,8 +127,7 @@ class RelevanceScorer:
         subreddit = getattr(post, "subreddit", None)
         if subreddit:
             subreddit_name = str(subreddit).lower()
-            for phrase in query_phrases:
-                phrase_condensed = phrase.replace(" ", "")
+            for phrase, phrase_condensed in zip(query_phrases, features.condensed_phrases):
                 if phrase_condensed in subreddit_name or phrase in subreddit_name:
                     score += 0.1
                     reasons.append(f"Query in subreddit: r/{subreddit}")
@@ -97,29 +139,68 @@ class RelevanceScorer:
         return ScoredPost(post=post, relevance_score=score, match_reasons=reasons)
 
     def filter_posts(
-        self, posts: List[Any], query: str
+        self,
+        posts: List[Any],
+        query: str,
+        return_filtered: bool = True,
     ) -> Tuple[List[ScoredPost], List[ScoredPost]]:
         """Filter and score posts for relevance.
 
         Args:
             posts: List of Reddit submissions
             query: User's search query
+            return_filtered: If False, posts below the threshold are dropped as
+                they are scored and filtered_out_posts is returned empty
 
         Returns:
             Tuple of (relevant_posts, filtered_out_posts)
         """
-        scored_posts = [self.score_post(post, query) for post in posts]
+        features = self._prepare_query(query)
+        threshold = self.min_threshold
+
+        # Partition in one pass
+        relevant: List[ScoredPost] = []
+        filtered_out: List[ScoredPost] = []
+        for post in posts:
+            scored_post = self._score_post(post, features)
+            if scored_post.relevance_score >= threshold:
+                relevant.append(scored_post)
+            elif return_filtered:
+                filtered_out.append(scored_post)
+
+        # Rank by relevance score * upvotes (combined ranking)
+        relevant.sort(key=_rank_key, reverse=True)
+
+        return relevant, filtered_out
 
-        relevant = [sp for sp in scored_posts if sp.relevance_score >= self.min_threshold]
-        filtered_out = [sp for sp in scored_posts if sp.relevance_score < self.min_threshold]
+    async def filter_stream(
+        self, posts: AsyncIterable[Any], query: str
+    ) -> Tuple[List[ScoredPost], int]:
+        """Score posts as they arrive and keep the relevant ones.
 
-        # Sort by relevance score * upvotes (combined ranking)
-        relevant.sort(
-            key=lambda sp: sp.relevance_score * max(getattr(sp.post, "score", 1), 1),
-            reverse=True,
-        )
+        Scoring a post is cheap, so it runs inline between network reads
+        rather than after the whole listing has been collected.
 
-        return relevant, filtered_out
+        Args:
+            posts: Async iterable of Reddit submissions
+            query: User's search query
+
+        Returns:
+            Tuple of (relevant_posts ranked like filter_posts(), posts_scanned)
+        """
+        features = self._prepare_query(query)
+        threshold = self.min_threshold
+
+        relevant: List[ScoredPost] = []
+        scanned = 0
+        async for post in posts:
+            scanned += 1
+            scored_post = self._score_post(post, features)
+            if scored_post.relevance_score >= threshold:
+                relevant.append(scored_post)
+
+        relevant.sort(key=_rank_key, reverse=True)
+        return relevant, scanned
 
     def _extract_phrases(self, query: str) -> List[str]:
         """Extract meaningful phrases from query.
@@ -1,12 +1,15 @@
 """Retry decorator with exponential backoff."""
 
 import asyncio
+import logging
 import random
 from functools import wraps
 from typing import Callable, Tuple, Type, TypeVar
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
 
 def async_retry_with_backoff(
     max_retries: int = 5,
@@ -27,6 +30,12 @@ def async_retry_with_backoff(
         retryable_exceptions: Tuple of exception types to retry on
     """
 
+    # Backoff delays don't depend on the call, so compute them once per decorator
+    delays = [
+        min(base_delay * (exponential_base**attempt), max_delay)
+        for attempt in range(max_retries)
+    ]
+
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
@@ -41,16 +50,17 @@ def async_retry_with_backoff(
                     if attempt == max_retries:
                         raise
 
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (exponential_base**attempt), max_delay)
-
-                    # Add jitter to prevent thundering herd
+                    # Exponential backoff, with jitter to prevent thundering herd
+                    delay = delays[attempt]
                     if jitter:
-                        delay = delay * (0.5 + random.random())
+                        delay *= 0.5 + random.random()
 
-                    print(
-                        f"{func.__name__} attempt {attempt + 1} failed: {e}. "
-                        f"Retrying in {delay:.2f}s..."
+                    logger.warning(
+                        "%s attempt %d failed: %s. Retrying in %.2fs...",
+                        func.__name__,
+                        attempt + 1,
+                        e,
+                        delay,
                     )
                     await asyncio.sleep(delay)
 
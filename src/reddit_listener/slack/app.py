@@ -2,7 +2,7 @@
 
 import asyncio
 import secrets
-from typing import Optional
+from typing import Optional, Set
 
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from slack_bolt.async_app import AsyncApp
@@ -47,7 +47,8 @@ class SlackBot:
         # Initialize LLM analyzer
         self.llm_analyzer = LLMAnalyzer(
             api_key=self.config.openrouter_api_key,
-            model=self.config.openrouter_model
+            model=self.config.openrouter_model,
+            require_schema_providers=self.config.openrouter_require_parameters,
         )
 
         # Initialize research service
@@ -62,11 +63,19 @@ class SlackBot:
         # OAuth state storage (in-memory for Phase 1)
         self.oauth_states = {}
 
+        # Research runs in progress; held so they aren't garbage collected
+        self._pending_tasks: Set[asyncio.Task] = set()
+
         # Register handlers
         self._register_handlers()
 
     def _register_handlers(self) -> None:
         """Register Slack command and event handlers."""
+        # Bind services once; the handlers below close over these locals
+        reddit_client = self.reddit_client
+        callback_server = self.callback_server
+        oauth_states = self.oauth_states
+        pending_tasks = self._pending_tasks
 
         @self.app.command("/research")
         async def handle_research(ack, command, respond):
@@ -85,37 +94,15 @@ class SlackBot:
             team_id = command["team_id"]
             user_id = command["user_id"]
 
-            # Run research in background
-            try:
-                # Send processing message
-                await respond(blocks=blocks.format_processing_message(query))
-                
-                # Note: For server-side auth, set team_id and user_id to None
-                # For user auth, use actual team_id and user_id
-                result = await self.research_service.research(
-                    query=query,
-                    team_id=None,  # Use server-side auth for now
-                    user_id=None,
-                )
+            # Send processing message, then run research in the background so
+            # the handler returns right away; results go to the same respond URL
+            await respond(blocks=blocks.format_processing_message(query))
 
-                # Send results
-                await respond(blocks=blocks.format_research_results(result))
-
-            except ValueError as e:
-                # User needs to authorize Reddit
-                if "not authorized" in str(e).lower():
-                    await respond(blocks=blocks.format_auth_required_message())
-                else:
-                    await respond(blocks=blocks.format_error_message(str(e)))
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                print(f"Error during research: {error_details}")
-                await respond(
-                    blocks=blocks.format_error_message(
-                        f"An error occurred: {str(e)}"
-                    )
-                )
+            task = asyncio.create_task(
+                self._run_research_and_reply(query, team_id, user_id, respond)
+            )
+            pending_tasks.add(task)
+            task.add_done_callback(pending_tasks.discard)
 
         @self.app.command("/connect-reddit")
         async def handle_connect_reddit(ack, command, respond):
@@ -127,64 +114,59 @@ class SlackBot:
 
             # Generate OAuth state for CSRF protection
             state = secrets.token_urlsafe(32)
-            self.oauth_states[state] = {"team_id": team_id, "user_id": user_id}
+            oauth_states[state] = {"team_id": team_id, "user_id": user_id}
 
-            # Register callback future
-            callback_future = self.callback_server.register_pending_callback(state)
+            try:
+                # Register callback future
+                callback_future = callback_server.register_pending_callback(state)
 
-            # Generate authorization URL
-            auth_url = self.reddit_client.get_auth_url(state)
+                # Generate authorization URL
+                auth_url = reddit_client.get_auth_url(state)
 
-            await respond(
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "🔗 *Connect your Reddit account*\n"
-                            "Click the button below to authorize Reddit access.\n"
-                            "After authorizing, you'll be redirected back automatically.",
+                await respond(
+                    blocks=[
+                        {
+                            "type": "section",
+                            "text": {
+                                "type": "mrkdwn",
+                                "text": "🔗 *Connect your Reddit account*\n"
+                                "Click the button below to authorize Reddit access.\n"
+                                "After authorizing, you'll be redirected back automatically.",
+                            },
                         },
-                    },
-                    {
-                        "type": "actions",
-                        "elements": [
-                            {
-                                "type": "button",
-                                "text": {"type": "plain_text", "text": "Connect Reddit"},
-                                "url": auth_url,
-                                "style": "primary",
-                            }
-                        ],
-                    },
-                ]
-            )
+                        {
+                            "type": "actions",
+                            "elements": [
+                                {
+                                    "type": "button",
+                                    "text": {"type": "plain_text", "text": "Connect Reddit"},
+                                    "url": auth_url,
+                                    "style": "primary",
+                                }
+                            ],
+                        },
+                    ]
+                )
 
-            # Wait for callback (with timeout)
-            try:
-                callback_data = await asyncio.wait_for(callback_future, timeout=300)  # 5 min timeout
-                code = callback_data["code"]
-                
-                # Exchange code for token
-                await self.reddit_client.exchange_code(code, team_id, user_id)
-                
-                # Clean up state
-                self.oauth_states.pop(state, None)
-                self.callback_server.pending_callbacks.pop(state, None)
-                
-                # Send success message
-                await respond("✅ Reddit account connected successfully! You can now use `/research` with your personal Reddit access.")
-                
-            except asyncio.TimeoutError:
-                # Clean up state
-                self.oauth_states.pop(state, None)
-                self.callback_server.pending_callbacks.pop(state, None)
-                await respond("⏱️ Reddit authorization timed out. Please try `/connect-reddit` again.")
-            except Exception as e:
-                # Clean up state
-                self.oauth_states.pop(state, None)
-                self.callback_server.pending_callbacks.pop(state, None)
-                await respond(f"❌ Error connecting Reddit account: {str(e)}")
+                # Wait for callback (with timeout)
+                try:
+                    callback_data = await asyncio.wait_for(callback_future, timeout=300)  # 5 min timeout
+                    code = callback_data["code"]
+
+                    # Exchange code for token
+                    await reddit_client.exchange_code(code, team_id, user_id)
+
+                    # Send success message
+                    await respond("✅ Reddit account connected successfully! You can now use `/research` with your personal Reddit access.")
+
+                except asyncio.TimeoutError:
+                    await respond("⏱️ Reddit authorization timed out. Please try `/connect-reddit` again.")
+                except Exception as e:
+                    await respond(f"❌ Error connecting Reddit account: {str(e)}")
+            finally:
+                # Always release the state, even if responding or the exchange fails
+                oauth_states.pop(state, None)
+                callback_server.pending_callbacks.pop(state, None)
 
         @self.app.event("app_mention")
         async def handle_app_mention(event, say):
@@ -209,6 +191,45 @@ class SlackBot:
             else:
                 await say("👋 Hi! Use `/research <query>` to research topics on Reddit. Type `@reddit-listener help` for more info.")
 
+    async def _run_research_and_reply(
+        self, query: str, team_id: str, user_id: str, respond
+    ) -> None:
+        """Run research for a /research command and post the results.
+
+        Args:
+            query: Search query from the command
+            team_id: Slack team ID of the requester
+            user_id: Slack user ID of the requester
+            respond: Bolt respond function for the command
+        """
+        try:
+            # Note: For server-side auth, set team_id and user_id to None
+            # For user auth, use actual team_id and user_id
+            result = await self.research_service.research(
+                query=query,
+                team_id=None,  # Use server-side auth for now
+                user_id=None,
+            )
+
+            # Send results
+            await respond(blocks=blocks.format_research_results(result))
+
+        except ValueError as e:
+            # User needs to authorize Reddit
+            if "not authorized" in str(e).lower():
+                await respond(blocks=blocks.format_auth_required_message())
+            else:
+                await respond(blocks=blocks.format_error_message(str(e)))
+        except Exception as e:
+            import traceback
+            error_details = traceback.format_exc()
+            print(f"Error during research: {error_details}")
+            await respond(
+                blocks=blocks.format_error_message(
+                    f"An error occurred: {str(e)}"
+                )
+            )
+
     async def start(self) -> None:
         """Start the Slack bot in Socket Mode."""
         # Start OAuth callback server
@@ -220,6 +241,11 @@ class SlackBot:
 
     async def close(self) -> None:
         """Close all connections."""
+        # Stop research still in progress before closing the clients it uses
+        for task in list(self._pending_tasks):
+            task.cancel()
+        await asyncio.gather(*self._pending_tasks, return_exceptions=True)
+
         await self.callback_server.stop()
         await self.token_store.close()
         await self.reddit_client.close()
@@ -1,11 +1,85 @@
 """Slack Block Kit UI formatters."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from ..analysis.llm import ContentIdea, PainPoint
 from ..core.research import ResearchResult
 
 
+def _mrkdwn_section(text: str) -> Dict[str, Any]:
+    """Build a section block with markdown text."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+# Slack's limit on the text of a single section block
+_MAX_SECTION_TEXT = 3000
+
+
+def _combined_sections(items: Iterable[str]) -> List[Dict[str, Any]]:
+    """Pack items into as few sections as fit Slack's text limit.
+
+    Items are separated by a blank line. An item that is too long on its
+    own still gets a section to itself.
+
+    Args:
+        items: Markdown text for each item, in display order
+
+    Returns:
+        Section blocks holding all items
+    """
+    sections = []
+    chunk: List[str] = []
+    length = 0
+    for item in items:
+        # Account for the blank line joining this item to the previous one
+        added = len(item) + (2 if chunk else 0)
+        if chunk and length + added > _MAX_SECTION_TEXT:
+            sections.append(_mrkdwn_section("\n\n".join(chunk)))
+            chunk, length, added = [], 0, len(item)
+        chunk.append(item)
+        length += added
+    if chunk:
+        sections.append(_mrkdwn_section("\n\n".join(chunk)))
+    return sections
+
+
+# Blocks that never change are built once and shared between messages.
+# Slack serializes them by value, so they must never be mutated.
+_DIVIDER = {"type": "divider"}
+
+_QUESTIONS_HEADER = _mrkdwn_section("*🤔 Top 10 Questions People Are Asking:*")
+_NO_QUESTIONS = _mrkdwn_section("_No questions found_")
+
+_KEYWORDS_HEADER = _mrkdwn_section("*🔑 Top Keywords & Phrases:*")
+_NO_KEYWORDS = _mrkdwn_section("_No keywords found_")
+
+_PAIN_POINTS_HEADER = _mrkdwn_section("*😰 Top 10 Pain Points & Community Solutions:*")
+_NO_PAIN_POINTS = _mrkdwn_section("_No pain points identified_")
+
+_CONTENT_IDEAS_HEADER = _mrkdwn_section("*✍️ Content Ideas:*")
+_NO_CONTENT_IDEAS = _mrkdwn_section("_No content ideas generated_")
+
+_FOOTER = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "📡 _Powered by Reddit API & Minimax M2.1_"
+        }
+    ]
+}
+
+_AUTH_REQUIRED_BLOCK = _mrkdwn_section(
+    "🔐 *Reddit Authorization Required*\n"
+    "Please connect your Reddit account first using `/connect-reddit`"
+)
+
+_AUTH_SUCCESS_BLOCK = _mrkdwn_section(
+    "✅ *Successfully connected to Reddit!*\n"
+    "You can now use `/research <query>` to research topics."
+)
+
+
 def format_research_results(result: ResearchResult) -> List[Dict[str, Any]]:
     """Format research results as Slack Block Kit blocks.
 
@@ -15,152 +89,69 @@ def format_research_results(result: ResearchResult) -> List[Dict[str, Any]]:
     Returns:
         List of Slack Block Kit blocks
     """
-    blocks = []
-
     # Header
-    blocks.append({
-        "type": "header",
-        "text": {
-            "type": "plain_text",
-            "text": f"📊 Research Results: {result.query}",
-        }
-    })
-
-    blocks.append({"type": "divider"})
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"📊 Research Results: {result.query}",
+            }
+        },
+        _DIVIDER,
+    ]
 
     # Section 1: Top Questions
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*🤔 Top 10 Questions People Are Asking:*"
-        }
-    })
-
+    blocks.append(_QUESTIONS_HEADER)
     if result.questions:
-        questions_text = "\n".join([f"{i+1}. {q}" for i, q in enumerate(result.questions)])
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": questions_text
-            }
-        })
+        questions_text = "\n".join([f"{i}. {q}" for i, q in enumerate(result.questions, 1)])
+        blocks.append(_mrkdwn_section(questions_text))
     else:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "_No questions found_"
-            }
-        })
+        blocks.append(_NO_QUESTIONS)
 
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
 
     # Section 2: Keywords
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*🔑 Top Keywords & Phrases:*"
-        }
-    })
-
+    blocks.append(_KEYWORDS_HEADER)
     if result.keywords:
-        keywords_text = " • ".join([f"`{k}`" for k in result.keywords])
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": keywords_text
-            }
-        })
+        keywords_text = " • ".join(map("`{}`".format, result.keywords))
+        blocks.append(_mrkdwn_section(keywords_text))
     else:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "_No keywords found_"
-            }
-        })
+        blocks.append(_NO_KEYWORDS)
 
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
 
     # Section 3: Pain Points
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*😰 Top 10 Pain Points & Community Solutions:*"
-        }
-    })
-
+    blocks.append(_PAIN_POINTS_HEADER)
     if result.pain_points:
-        for i, pp in enumerate(result.pain_points, 1):
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": (
-                        f"*{i}. {pp.description}* (↑ {pp.upvotes})\n"
-                        f"💡 _Solution:_ {pp.solution_summary}"
-                    )
-                }
-            })
+        blocks.extend(
+            _combined_sections(
+                f"*{i}. {pp.description}* (↑ {pp.upvotes})\n"
+                f"💡 _Solution:_ {pp.solution_summary}"
+                for i, pp in enumerate(result.pain_points, 1)
+            )
+        )
     else:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "_No pain points identified_"
-            }
-        })
+        blocks.append(_NO_PAIN_POINTS)
 
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
 
     # Section 4: Content Ideas
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*✍️ Content Ideas:*"
-        }
-    })
-
+    blocks.append(_CONTENT_IDEAS_HEADER)
     if result.content_ideas:
-        for i, idea in enumerate(result.content_ideas, 1):
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": (
-                        f"*{i}. {idea.title}*\n"
-                        f"{idea.description}\n"
-                        f"_Why:_ {idea.rationale}"
-                    )
-                }
-            })
+        blocks.extend(
+            _combined_sections(
+                f"*{i}. {idea.title}*\n"
+                f"{idea.description}\n"
+                f"_Why:_ {idea.rationale}"
+                for i, idea in enumerate(result.content_ideas, 1)
+            )
+        )
     else:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "_No content ideas generated_"
-            }
-        })
-
-    blocks.append({"type": "divider"})
+        blocks.append(_NO_CONTENT_IDEAS)
 
     # Footer
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": "📡 _Powered by Reddit API & Minimax M2.1_"
-            }
-        ]
-    })
+    blocks.extend((_DIVIDER, _FOOTER))
 
     return blocks
 
@@ -174,15 +165,7 @@ def format_error_message(error: str) -> List[Dict[str, Any]]:
     Returns:
         List of Slack Block Kit blocks
     """
-    return [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"❌ *Error:* {error}"
-            }
-        }
-    ]
+    return [_mrkdwn_section(f"❌ *Error:* {error}")]
 
 
 def format_processing_message(query: str) -> List[Dict[str, Any]]:
@@ -195,13 +178,9 @@ def format_processing_message(query: str) -> List[Dict[str, Any]]:
         List of Slack Block Kit blocks
     """
     return [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"🔍 Researching *{query}* on Reddit...\n_This may take 30-60 seconds..._"
-            }
-        }
+        _mrkdwn_section(
+            f"🔍 Researching *{query}* on Reddit...\n_This may take 30-60 seconds..._"
+        )
     ]
 
 
@@ -211,16 +190,7 @@ def format_auth_required_message() -> List[Dict[str, Any]]:
     Returns:
         List of Slack Block Kit blocks
     """
-    return [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "🔐 *Reddit Authorization Required*\n"
-                "Please connect your Reddit account first using `/connect-reddit`"
-            }
-        }
-    ]
+    return [_AUTH_REQUIRED_BLOCK]
 
 
 def format_auth_success_message() -> List[Dict[str, Any]]:
@@ -229,13 +199,4 @@ def format_auth_success_message() -> List[Dict[str, Any]]:
     Returns:
         List of Slack Block Kit blocks
     """
-    return [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "✅ *Successfully connected to Reddit!*\n"
-                "You can now use `/research <query>` to research topics."
-            }
-        }
-    ]
+    return [_AUTH_SUCCESS_BLOCK]
@@ -1,10 +1,161 @@
 """OAuth callback server for Reddit authentication."""
 
 import asyncio
+import gzip
+import html
 from typing import Dict
 from aiohttp import web
 
 
+def _render_page(title: str, icon_class: str, icon: str, heading: str, message: str, hint: str) -> str:
+    """Render a callback result page shown in the user's browser.
+
+    Args:
+        title: Page title
+        icon_class: CSS class for the icon ("success" or "error")
+        icon: Emoji shown above the heading
+        heading: Main heading text
+        message: First paragraph (HTML-escaped by the caller if untrusted)
+        hint: Second paragraph telling the user what to do next
+
+    Returns:
+        Complete HTML document
+    """
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>{title}</title>
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    max-width: 600px;
+                    margin: 100px auto;
+                    padding: 40px;
+                    text-align: center;
+                    background: #f5f5f5;
+                }}
+                .container {{
+                    background: white;
+                    padding: 40px;
+                    border-radius: 8px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                }}
+                .success {{
+                    color: #2eb886;
+                    font-size: 48px;
+                    margin-bottom: 20px;
+                }}
+                .error {{
+                    color: #e01e5a;
+                    font-size: 48px;
+                    margin-bottom: 20px;
+                }}
+                h1 {{
+                    color: #1a1a1a;
+                    margin-bottom: 16px;
+                }}
+                p {{
+                    color: #616061;
+                    line-height: 1.5;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="{icon_class}">{icon}</div>
+                <h1>{heading}</h1>
+                <p>{message}</p>
+                <p>{hint}</p>
+            </div>
+        </body>
+        </html>
+        """
+
+
+# Static pages are rendered and encoded once; only the error page varies
+_SUCCESS_HTML = _render_page(
+    "Reddit Connected!",
+    "success",
+    "✅",
+    "Reddit Connected Successfully!",
+    "Your Reddit account has been linked.",
+    "You can close this window and return to Slack.",
+).encode("utf-8")
+
+_INVALID_HTML = _render_page(
+    "Invalid Request",
+    "error",
+    "⚠️",
+    "Invalid Request",
+    "Missing authorization code or state parameter.",
+    "You can close this window and try again in Slack.",
+).encode("utf-8")
+
+# Gzipped copies for clients that accept it; the pages are mostly repeated CSS
+_SUCCESS_HTML_GZ = gzip.compress(_SUCCESS_HTML, compresslevel=9)
+_INVALID_HTML_GZ = gzip.compress(_INVALID_HTML, compresslevel=9)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a gzip response.
+
+    An explicit ``gzip`` (or ``x-gzip``) coding takes precedence over ``*``,
+    and a coding with ``q=0`` is not acceptable.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        True if gzip is acceptable
+    """
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "x-gzip", "*"):
+            continue
+
+        accepted = True
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    accepted = float(value) > 0
+                except ValueError:
+                    accepted = False
+
+        if name == "*":
+            wildcard = accepted
+        else:
+            return accepted
+
+    return wildcard
+
+
+def _static_page_response(
+    request: web.Request, body: bytes, body_gz: bytes, status: int = 200
+) -> web.Response:
+    """Serve a pre-rendered page, gzipped if the client accepts it.
+
+    Args:
+        request: Incoming HTTP request
+        body: UTF-8 encoded page
+        body_gz: The same page, gzip-compressed
+        status: HTTP status code
+
+    Returns:
+        HTML response
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        body = body_gz
+    return web.Response(
+        body=body, status=status, content_type="text/html", charset="utf-8", headers=headers
+    )
+
+
 class OAuthCallbackServer:
     """Simple HTTP server to handle Reddit OAuth callbacks."""
 
@@ -35,156 +186,33 @@ class OAuthCallbackServer:
         error = request.query.get("error")
 
         if error:
-            html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Reddit Connection Failed</title>
-                <style>
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        max-width: 600px;
-                        margin: 100px auto;
-                        padding: 40px;
-                        text-align: center;
-                        background: #f5f5f5;
-                    }}
-                    .container {{
-                        background: white;
-                        padding: 40px;
-                        border-radius: 8px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }}
-                    .error {{
-                        color: #e01e5a;
-                        font-size: 48px;
-                        margin-bottom: 20px;
-                    }}
-                    h1 {{
-                        color: #1a1a1a;
-                        margin-bottom: 16px;
-                    }}
-                    p {{
-                        color: #616061;
-                        line-height: 1.5;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="error">❌</div>
-                    <h1>Connection Failed</h1>
-                    <p>Reddit authorization was denied or an error occurred: {error}</p>
-                    <p>You can close this window and try again in Slack.</p>
-                </div>
-            </body>
-            </html>
-            """
-            return web.Response(text=html, content_type="text/html", status=400)
+            # The error comes from the query string, so escape it before echoing it
+            page = _render_page(
+                "Reddit Connection Failed",
+                "error",
+                "❌",
+                "Connection Failed",
+                f"Reddit authorization was denied or an error occurred: {html.escape(error)}",
+                "You can close this window and try again in Slack.",
+            )
+            return web.Response(text=page, content_type="text/html", status=400)
 
         if not code or not state:
-            html = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Invalid Request</title>
-                <style>
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        max-width: 600px;
-                        margin: 100px auto;
-                        padding: 40px;
-                        text-align: center;
-                        background: #f5f5f5;
-                    }}
-                    .container {{
-                        background: white;
-                        padding: 40px;
-                        border-radius: 8px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }}
-                    .error {{
-                        color: #e01e5a;
-                        font-size: 48px;
-                        margin-bottom: 20px;
-                    }}
-                    h1 {{
-                        color: #1a1a1a;
-                        margin-bottom: 16px;
-                    }}
-                    p {{
-                        color: #616061;
-                        line-height: 1.5;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="error">⚠️</div>
-                    <h1>Invalid Request</h1>
-                    <p>Missing authorization code or state parameter.</p>
-                    <p>You can close this window and try again in Slack.</p>
-                </div>
-            </body>
-            </html>
-            """
-            return web.Response(text=html, content_type="text/html", status=400)
-
-        # Store the callback result for the pending OAuth flow
-        if state in self.pending_callbacks:
-            future = self.pending_callbacks[state]
+            return _static_page_response(request, _INVALID_HTML, _INVALID_HTML_GZ, status=400)
+
+        # Hand the result to the pending OAuth flow; popping means a replayed
+        # callback for the same state finds nothing
+        future = self.pending_callbacks.pop(state, None)
+        if future is not None and not future.done():
             future.set_result({"code": code, "state": state})
 
         # Return success page
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Reddit Connected!</title>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    max-width: 600px;
-                    margin: 100px auto;
-                    padding: 40px;
-                    text-align: center;
-                    background: #f5f5f5;
-                }
-                .container {
-                    background: white;
-                    padding: 40px;
-                    border-radius: 8px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                }
-                .success {
-                    color: #2eb886;
-                    font-size: 48px;
-                    margin-bottom: 20px;
-                }
-                h1 {
-                    color: #1a1a1a;
-                    margin-bottom: 16px;
-                }
-                p {
-                    color: #616061;
-                    line-height: 1.5;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="success">✅</div>
-                <h1>Reddit Connected Successfully!</h1>
-                <p>Your Reddit account has been linked.</p>
-                <p>You can close this window and return to Slack.</p>
-            </div>
-        </body>
-        </html>
-        """
-        return web.Response(text=html, content_type="text/html")
+        return _static_page_response(request, _SUCCESS_HTML, _SUCCESS_HTML_GZ)
 
     def register_pending_callback(self, state: str) -> asyncio.Future:
         """Register a future to track a pending OAuth callback.
+
+        Must be called from a coroutine running on the server's event loop.
         
         Args:
             state: OAuth state parameter
@@ -192,8 +220,15 @@ class OAuthCallbackServer:
         Returns:
             Future that will be resolved when callback is received
         """
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         self.pending_callbacks[state] = future
+
+        # Drop the entry if the flow gives up first (timeout or cancellation)
+        def discard(_: asyncio.Future) -> None:
+            if self.pending_callbacks.get(state) is future:
+                del self.pending_callbacks[state]
+
+        future.add_done_callback(discard)
         return future
 
     async def start(self):
@@ -1,16 +1,66 @@
 """SQLite-based token storage with encryption."""
 
+import asyncio
+import base64
 import json
 import os
-from datetime import datetime
+import struct
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Union
 
 import aiosqlite
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from .base import TokenData, TokenStore
 
+# Connection settings applied before the schema is created. WAL with
+# synchronous=NORMAL fsyncs on checkpoints instead of on every commit and
+# lets reads proceed while a write is in progress.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",  # 8 MB page cache
+)
+
+# Statements used on every token operation. sqlite3 caches prepared statements
+# by SQL text, so keeping each one in a single constant guarantees cache hits.
+_SAVE_SQL = """
+    INSERT INTO tokens (team_id, user_id, encrypted_data, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(team_id, user_id) DO UPDATE SET
+        encrypted_data = excluded.encrypted_data,
+        updated_at = excluded.updated_at
+"""
+_GET_SQL = "SELECT encrypted_data FROM tokens WHERE team_id = ? AND user_id = ?"
+_DELETE_SQL = "DELETE FROM tokens WHERE team_id = ? AND user_id = ?"
+_MIGRATE_SQL = (
+    "UPDATE tokens SET encrypted_data = ? WHERE team_id = ? AND user_id = ? "
+    "AND encrypted_data = ?"
+)
+
+# Naive UTC epoch, for storing expires_at as whole seconds
+_EPOCH = datetime(1970, 1, 1)
+
+# Plaintext layout of a stored token: format version, expires_at (epoch
+# seconds) and the byte lengths of the access and refresh tokens, followed
+# by the UTF-8 access token, refresh token and scope.
+_TOKEN_HEADER = struct.Struct("<BqHH")
+_TOKEN_FORMAT_VERSION = 1
+
+# AES-GCM nonce size in bytes
+_NONCE_SIZE = 12
+
+# Decrypted tokens are kept in memory for this long after a read
+_TOKEN_CACHE_TTL = 60.0
+
+# Maximum number of users whose decrypted tokens are kept in memory
+_TOKEN_CACHE_MAX_ENTRIES = 1024
+
 
 class SQLiteTokenStore(TokenStore):
     """SQLite implementation of token storage with AES encryption."""
@@ -23,51 +73,121 @@ class SQLiteTokenStore(TokenStore):
             encryption_key: Hex-encoded encryption key (32 bytes = 64 hex chars)
         """
         self.db_path = db_path
-        # Convert hex key to Fernet-compatible format
+        # Ensure directory exists
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         key_bytes = bytes.fromhex(encryption_key)
-        # Fernet requires base64-encoded 32-byte key
-        import base64
-        fernet_key = base64.urlsafe_b64encode(key_bytes)
-        self.cipher = Fernet(fernet_key)
+        # New rows use AES-256-GCM with the key as is
+        self.aead = AESGCM(key_bytes)
+        # Fernet (base64-encoded key) is kept to read rows written before AES-GCM
+        self.cipher = Fernet(base64.urlsafe_b64encode(key_bytes))
         self._connection: Optional[aiosqlite.Connection] = None
+        # Serializes the first connect so concurrent callers share one connection;
+        # created on first use so it binds to the running loop on Python 3.9
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # (team_id, user_id) -> (token, monotonic expiry), least recently used first
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[TokenData, float]]" = OrderedDict()
+        # Bumped on every write so a read that raced a write doesn't cache stale data
+        self._cache_generation = 0
 
     async def _get_connection(self) -> aiosqlite.Connection:
         """Get or create database connection."""
         if self._connection is None:
-            # Ensure directory exists
-            db_dir = Path(self.db_path).parent
-            db_dir.mkdir(parents=True, exist_ok=True)
-
-            self._connection = await aiosqlite.connect(self.db_path)
-            await self._initialize_db()
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            async with self._connect_lock:
+                # Another caller may have connected while this one waited
+                if self._connection is None:
+                    connection = await aiosqlite.connect(self.db_path, cached_statements=256)
+                    for pragma in _PRAGMAS:
+                        await connection.execute(pragma)
+                    await self._initialize_db(connection)
+                    # Publish only once the schema exists, for the lock-free check above
+                    self._connection = connection
 
         return self._connection
 
-    async def _initialize_db(self) -> None:
-        """Create tables if they don't exist."""
-        if self._connection is None:
-            raise RuntimeError("Database connection not established")
+    async def _initialize_db(self, connection: aiosqlite.Connection) -> None:
+        """Create tables if they don't exist.
 
-        await self._connection.execute(
+        Args:
+            connection: Newly opened database connection
+        """
+        await connection.execute(
             """
             CREATE TABLE IF NOT EXISTS tokens (
                 team_id TEXT NOT NULL,
                 user_id TEXT NOT NULL,
-                encrypted_data TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
+                encrypted_data BLOB NOT NULL,
+                updated_at INTEGER NOT NULL,  -- Unix epoch seconds
                 PRIMARY KEY (team_id, user_id)
             )
             """
         )
-        await self._connection.commit()
+        await connection.commit()
 
-    def _encrypt(self, data: str) -> str:
-        """Encrypt data."""
-        return self.cipher.encrypt(data.encode()).decode()
+    def _encrypt(self, token_data: TokenData) -> bytes:
+        """Serialize a token compactly and encrypt it with AES-GCM.
 
-    def _decrypt(self, encrypted_data: str) -> str:
-        """Decrypt data."""
-        return self.cipher.decrypt(encrypted_data.encode()).decode()
+        Returns:
+            Nonce followed by ciphertext, stored as a BLOB
+        """
+        access_token = token_data.access_token.encode()
+        refresh_token = token_data.refresh_token.encode()
+        payload = b"".join(
+            (
+                _TOKEN_HEADER.pack(
+                    _TOKEN_FORMAT_VERSION,
+                    int((token_data.expires_at - _EPOCH).total_seconds()),
+                    len(access_token),
+                    len(refresh_token),
+                ),
+                access_token,
+                refresh_token,
+                token_data.scope.encode(),
+            )
+        )
+        nonce = os.urandom(_NONCE_SIZE)
+        return nonce + self.aead.encrypt(nonce, payload, None)
+
+    def _decrypt(self, encrypted_data: Union[bytes, str]) -> TokenData:
+        """Decrypt a stored token.
+
+        Args:
+            encrypted_data: BLOB from _encrypt(), or a text row holding JSON
+                encrypted with Fernet
+
+        Returns:
+            Decrypted token data
+
+        Raises:
+            ValueError: If a BLOB uses an unknown payload format version
+        """
+        if isinstance(encrypted_data, bytes):
+            nonce, ciphertext = encrypted_data[:_NONCE_SIZE], encrypted_data[_NONCE_SIZE:]
+            payload = self.aead.decrypt(nonce, ciphertext, None)
+            version, expires_at, access_len, refresh_len = _TOKEN_HEADER.unpack_from(payload)
+            if version != _TOKEN_FORMAT_VERSION:
+                raise ValueError(f"Unsupported token format version: {version}")
+            access_end = _TOKEN_HEADER.size + access_len
+            refresh_end = access_end + refresh_len
+            access_token = payload[_TOKEN_HEADER.size:access_end].decode()
+            refresh_token = payload[access_end:refresh_end].decode()
+            scope = payload[refresh_end:].decode()
+            return TokenData(
+                access_token=access_token,
+                refresh_token=refresh_token,
+                expires_at=_EPOCH + timedelta(seconds=expires_at),
+                scope=scope,
+            )
+
+        # Text rows were written with Fernet before tokens were stored as BLOBs
+        data_dict = json.loads(self.cipher.decrypt(encrypted_data.encode()))
+        return TokenData(
+            access_token=data_dict["access_token"],
+            refresh_token=data_dict["refresh_token"],
+            expires_at=datetime.fromisoformat(data_dict["expires_at"]),
+            scope=data_dict["scope"],
+        )
 
     async def save_token(
         self, team_id: str, user_id: str, token_data: TokenData
@@ -75,39 +195,29 @@ class SQLiteTokenStore(TokenStore):
         """Save or update a token for a user."""
         conn = await self._get_connection()
 
-        # Serialize token data to JSON
-        data_dict = {
-            "access_token": token_data.access_token,
-            "refresh_token": token_data.refresh_token,
-            "expires_at": token_data.expires_at.isoformat(),
-            "scope": token_data.scope,
-        }
-        json_data = json.dumps(data_dict)
-
-        # Encrypt the data
-        encrypted_data = self._encrypt(json_data)
+        # Serialize and encrypt the token
+        encrypted_data = self._encrypt(token_data)
 
         # Save to database
+        self._invalidate(team_id, user_id)
         await conn.execute(
-            """
-            INSERT INTO tokens (team_id, user_id, encrypted_data, updated_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(team_id, user_id) DO UPDATE SET
-                encrypted_data = excluded.encrypted_data,
-                updated_at = excluded.updated_at
-            """,
-            (team_id, user_id, encrypted_data, datetime.utcnow().isoformat()),
+            _SAVE_SQL,
+            (team_id, user_id, encrypted_data, int(time.time())),
         )
         await conn.commit()
 
     async def get_token(self, team_id: str, user_id: str) -> Optional[TokenData]:
         """Retrieve a token for a user."""
+        key = (team_id, user_id)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            self._cache.move_to_end(key)
+            return entry[0]
+
+        generation = self._cache_generation
         conn = await self._get_connection()
 
-        cursor = await conn.execute(
-            "SELECT encrypted_data FROM tokens WHERE team_id = ? AND user_id = ?",
-            (team_id, user_id),
-        )
+        cursor = await conn.execute(_GET_SQL, (team_id, user_id))
         row = await cursor.fetchone()
 
         if not row:
@@ -115,28 +225,39 @@ class SQLiteTokenStore(TokenStore):
 
         # Decrypt and deserialize
         encrypted_data = row[0]
-        json_data = self._decrypt(encrypted_data)
-        data_dict = json.loads(json_data)
+        token_data = self._decrypt(encrypted_data)
 
-        return TokenData(
-            access_token=data_dict["access_token"],
-            refresh_token=data_dict["refresh_token"],
-            expires_at=datetime.fromisoformat(data_dict["expires_at"]),
-            scope=data_dict["scope"],
-        )
+        # Rewrite Fernet text rows as BLOBs
+        if isinstance(encrypted_data, str):
+            await conn.execute(
+                _MIGRATE_SQL,
+                (self._encrypt(token_data), team_id, user_id, encrypted_data),
+            )
+            await conn.commit()
+
+        if generation == self._cache_generation:
+            self._cache[key] = (token_data, time.monotonic() + _TOKEN_CACHE_TTL)
+            self._cache.move_to_end(key)
+            if len(self._cache) > _TOKEN_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+        return token_data
 
     async def delete_token(self, team_id: str, user_id: str) -> bool:
         """Delete a token for a user."""
         conn = await self._get_connection()
 
-        cursor = await conn.execute(
-            "DELETE FROM tokens WHERE team_id = ? AND user_id = ?",
-            (team_id, user_id),
-        )
+        self._invalidate(team_id, user_id)
+        cursor = await conn.execute(_DELETE_SQL, (team_id, user_id))
         await conn.commit()
 
         return cursor.rowcount > 0
 
+    def _invalidate(self, team_id: str, user_id: str) -> None:
+        """Drop a user's cached token before their row changes."""
+        self._cache_generation += 1
+        self._cache.pop((team_id, user_id), None)
+
     async def close(self) -> None:
         """Close database connection."""
         if self._connection: